@@ -313,13 +313,20 @@ class Bouquet:
     
     @staticmethod
     def delete_bouquet(name):
+        Bouquet.delete_bouquets([name])
+
+    @staticmethod
+    def delete_bouquets(names):
+        # Load and save the bouquets file once for the whole batch
         all_bouquets = load_all_bouquets()
-        
-        if name in all_bouquets:
+
+        for name in names:
+            if name not in all_bouquets:
+                raise ValueError(f"Bouquet '{name}' not found")
+
+        for name in names:
             del all_bouquets[name]
-            save_all_bouquets(all_bouquets)
-        else:
-            raise ValueError(f"Bouquet '{name}' not found")
+        save_all_bouquets(all_bouquets)
     
     @staticmethod
     def rename_bouquet(old_name, new_name):
@@ -1,14 +1,26 @@
 from collections import namedtuple
+from functools import lru_cache
 import json
 import pandas as pd
 import os
 
 FlowerData = namedtuple('FlowerData', ['name', 'color', 'size'])
 
+@lru_cache(maxsize=4096)
+def price_key(name, color, size):
+    """Order price key: 'Name - Color - Size'"""
+    return f"{name} - {color} - {size}"
+
+@lru_cache(maxsize=4096)
+def default_price_key(name, size):
+    """Default price list key: 'Name - Size'"""
+    return f"{name} - {size}"
+
 class FlowersTypes:
 
     def __init__(self):
         self.flowers = {}
+        self._sorted_names = None # Cached sorted(self.flowers); reset by _save()
         if os.path.exists('Flowers.xlsx'):
             try:
                 df = pd.read_excel('Flowers.xlsx')
@@ -63,7 +75,15 @@ class FlowersTypes:
     def get_config(self, name):
         return self.flowers.get(name, {'colors': [], 'sizes': []})
 
+    def sorted_names(self):
+        """Flower names in sorted order, as a tuple cached until the next save."""
+        if self._sorted_names is None:
+            self._sorted_names = tuple(sorted(self.flowers))
+        return self._sorted_names
+
     def _save(self):
+        # Every mutation (including direct edits to self.flowers) ends with a save
+        self._sorted_names = None
         data = []
         for name, config in self.flowers.items():
             # Colors column removed/ignored
@@ -110,6 +130,14 @@ class FlowerColors:
             self.colors.remove(color)
             self._save()
 
+    def remove_many(self, colors):
+        # Single save for a batch of removals
+        to_remove = set(colors)
+        remaining = [c for c in self.colors if c not in to_remove]
+        if len(remaining) != len(self.colors):
+            self.colors = remaining
+            self._save()
+
     def _save(self):
         df = pd.DataFrame({'Color': self.colors})
         try:
@@ -2,15 +2,20 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 import json
 import os
+import re
 import shutil
 import socket
 import sys
 import subprocess
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import bisect
+import logging
 import pandas as pd
 import webbrowser
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, Counter
 
 APP_VERSION = "1.0.0"
 
@@ -48,7 +53,7 @@ def ensure_data_files():
 
 ensure_data_files()
 
-from flower import FlowersTypes, FlowerColors, FlowerSizes, FlowerData
+from flower import FlowersTypes, FlowerColors, FlowerSizes, FlowerData, price_key, default_price_key
 from bouquet import Bouquet, load_all_bouquets, get_wix_id_map, set_bouquet_wix_id, get_bouquet_wix_data, update_wix_categories_batch
 from wix import WixInventoryManager
 try:
@@ -56,6 +61,137 @@ try:
     DRIVE_SYNC_AVAILABLE = True
 except ImportError:
     DRIVE_SYNC_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+try:
+    import xlsxwriter  # noqa: F401 (only used as a pandas engine)
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+# Diagnostic output for the Wix paths; enable with logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+# Strips currency symbols etc. from displayed Wix prices
+PRICE_CLEAN_RE = re.compile(r'[^\d.]')
+
+# "Visible" column text in the Wix product trees
+VISIBLE_YES, VISIBLE_NO = "כן", "לא"
+# Joins a variant's choice values into its row name, e.g. "אדום / גדול"
+VARIANT_NAME_SEP = " / "
+
+WIX_SITE_ID = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
+WIX_ACCOUNT_ID = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
+
+# Column types for DefaultPricing sheets; skips pandas' per-column type inference
+DEFAULT_PRICES_DTYPES = {"Flower Name": "string", "Size": "string", "Price": "float64"}
+
+def excel_writer(path, rows_in_order=False):
+    """
+    Open a pd.ExcelWriter for a new workbook, using xlsxwriter when it is installed
+    and openpyxl otherwise. Pass rows_in_order=True only when every sheet is filled
+    top to bottom through sheet_row_writer: xlsxwriter then runs in constant_memory
+    mode, which flushes each row as it goes and would drop cells written column by
+    column (as DataFrame.to_excel does).
+    """
+    if XLSXWRITER_AVAILABLE:
+        options = {'strings_to_urls': False}
+        if rows_in_order:
+            options['constant_memory'] = True
+        return pd.ExcelWriter(path, engine='xlsxwriter', engine_kwargs={'options': options})
+    return pd.ExcelWriter(path, engine='openpyxl')
+
+def sheet_row_writer(writer, sheet_name, header):
+    """
+    Add a sheet with a bold header row to an open ExcelWriter and return a
+    function that appends one row to it, for either writer engine.
+    """
+    if writer.engine == 'xlsxwriter':
+        ws = writer.book.add_worksheet(sheet_name)
+        ws.write_row(0, 0, header, writer.book.add_format({'bold': True}))
+        next_row = [1]
+
+        def append_row(values):
+            ws.write_row(next_row[0], 0, values)
+            next_row[0] += 1
+        return append_row
+
+    from openpyxl.styles import Font
+    ws = writer.book.create_sheet(sheet_name)
+    ws.append(header)
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+    return ws.append
+
+VISIBILITY_HEADER = ["Product ID", "Name", "Visible"]
+
+def write_visibility_backup(path, products):
+    """
+    Write the 'visibility' sheet of the Wix backup workbook straight from the
+    product dicts. A new file is streamed with a write-only workbook; an existing
+    one is loaded and only its 'visibility' sheet is replaced, in place.
+    """
+    import openpyxl
+    if os.path.exists(path):
+        wb = openpyxl.load_workbook(path)
+        index = None
+        if 'visibility' in wb.sheetnames:
+            index = wb.sheetnames.index('visibility')
+            wb.remove(wb['visibility'])
+        ws = wb.create_sheet('visibility', index)
+    else:
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet('visibility')
+    ws.append(VISIBILITY_HEADER)
+    for p in products:
+        ws.append([p['id'], p.get('name', ''), p.get('visible', True)])
+    wb.save(path)
+
+def read_visibility_backup(path):
+    """
+    Read the 'visibility' sheet of the Wix backup workbook into a
+    {product_id: was_visible} dict using a read-only workbook.
+    """
+    import openpyxl
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb['visibility'].iter_rows(values_only=True)
+        header = list(next(rows, None) or [])
+        id_col = header.index("Product ID")
+        visible_col = header.index("Visible")
+        state = {}
+        for row in rows:
+            if row[id_col] is not None:
+                state[row[id_col]] = row[visible_col]
+        return state
+    finally:
+        wb.close()
+
+def load_json_file(file_path):
+    """
+    Parse a JSON file, using orjson when it is installed and falling back to
+    the standard json module otherwise. Both return plain dicts/lists.
+    """
+    if ORJSON_AVAILABLE:
+        with open(file_path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def dump_json_file(file_path, data):
+    """
+    Write data as indented UTF-8 JSON, using orjson when it is installed and
+    the standard json module otherwise.
+    """
+    if ORJSON_AVAILABLE:
+        with open(file_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
 
 class FlowerApp:
     def __init__(self, root):
@@ -83,6 +219,22 @@ class FlowerApp:
         self.displayed_flowers = [] # Keep track of flowers displayed in listbox
         
         self.current_order = []
+        self._order_index = {} # Map bouquet name -> position in current_order
+        # Change counters for stored data and the current order; tabs skip refreshes when unchanged
+        self._versions = {'data': 0, 'order': 0}
+        self._last_refresh_versions = {} # Map tab text -> versions at its last refresh
+        self._bouquet_counts_cache = {} # Map bouquet name -> flower_count(), cleared on data changes
+        self._row_subtotal = {} # Order pricing tab: flower key -> price * count
+        self._grand_total_price = 0.0
+        self._total_price_after_id = None
+        self._order_pricing_rows = [] # Pooled row widgets for the order pricing tab
+        self._global_pricing_rows = [] # Pooled row widgets for the default prices tab
+        self._price_rows_by_var = {} # Tcl variable name -> pooled pricing row, for the shared trace handlers
+        self._wix_token = None # Parsed wix_token.json, see _get_wix_token()
+        self._wix_token_mtime = None
+        self._wix_manager = None # Shared Wix client, see _get_wix_manager()
+        self._pending_scrollregion = set() # Canvases with a scrollregion update queued
+        self.api_pool = ThreadPoolExecutor(max_workers=8) # Wix HTTP calls run here, off the Tk thread
         self.current_prices = {} # Store price per flower type
         self.default_prices = {} # Store default prices
         self.load_default_prices()
@@ -90,12 +242,13 @@ class FlowerApp:
         self.wix_categories = []
         self.selected_wix_category_ids = []
         self.category_tabs = {} # Map category_id -> tab frame
+        self.tab_to_cid = {} # Map tab widget path -> category_id (reverse of category_tabs)
         self.visibility_backup = None # Store visibility state for lock/unlock
         self.load_wix_config()
         
         self.data_dirty = False # Track if data has changed
         
-        self.tab_images = [] # Keep references to images
+        self.tab_images = {} # Keep references to images, one per color
 
         self.create_menu()
 
@@ -143,6 +296,18 @@ class FlowerApp:
             
     def mark_dirty(self):
         self.data_dirty = True
+        self._versions['data'] += 1
+        self._bouquet_counts_cache.clear()
+
+    def mark_order_changed(self):
+        self._versions['order'] += 1
+
+    def _tab_needs_refresh(self, tab_text):
+        current = (self._versions['data'], self._versions['order'])
+        if self._last_refresh_versions.get(tab_text) == current:
+            return False
+        self._last_refresh_versions[tab_text] = current
+        return True
         
     def perform_startup_sync(self):
         if not os.path.exists(os.path.join(application_path, 'credentials.json')):
@@ -243,17 +408,23 @@ class FlowerApp:
                     except Exception as e:
                         messagebox.showerror("שגיאת סנכרון", f"נכשל בהעלאה ל-Drive: {e}")
         
+        # Don't start queued Wix calls after the window is gone
+        self.api_pool.shutdown(wait=False)
+        if self._wix_manager is not None:
+            self._wix_manager.close()
         self.root.destroy()
 
     def load_default_prices(self):
         self.default_prices = {}
         if os.path.exists("DefaultPricing.xlsx"):
             try:
-                df = pd.read_excel("DefaultPricing.xlsx")
+                df = pd.read_excel("DefaultPricing.xlsx", engine="openpyxl",
+                                   usecols=["Flower Name", "Size", "Price"],
+                                   dtype=DEFAULT_PRICES_DTYPES)
                 # Expected columns: Flower Name, Size, Price
-                for _, row in df.iterrows():
-                    key = f"{row['Flower Name']} - {row['Size']}"
-                    self.default_prices[key] = float(row['Price'])
+                keys = df["Flower Name"].str.cat(df["Size"], sep=" - ", na_rep="").tolist()
+                prices = df["Price"].to_numpy(dtype="float64", copy=False).tolist()
+                self.default_prices = dict(zip(keys, prices))
             except Exception as e:
                 print(f"Error loading DefaultPricing.xlsx: {e}")
         elif os.path.exists("DefaultPricing.json"):
@@ -287,7 +458,7 @@ class FlowerApp:
     def save_default_prices(self):
         data = []
         # Iterate through all defined flowers to ensure complete list
-        for f_name in sorted(self.flower_types.flowers):
+        for f_name in self.flower_types.sorted_names():
             config = self.flower_types.get_config(f_name)
             valid_sizes = config.get('sizes', [])
             
@@ -336,9 +507,12 @@ class FlowerApp:
             messagebox.showerror("שגיאה", f"שגיאה בשמירת מחירי ברירת מחדל: {e}")
 
     def create_tab_image(self, color):
-        img = tk.PhotoImage(width=20, height=20)
-        img.put(color, to=(0, 0, 20, 20))
-        self.tab_images.append(img)
+        # Tabs of the same color (e.g. every Wix category tab) share one image
+        img = self.tab_images.get(color)
+        if img is None:
+            img = tk.PhotoImage(width=20, height=20)
+            img.put(color, to=(0, 0, 20, 20))
+            self.tab_images[color] = img
         return img
 
     def create_menu(self):
@@ -546,8 +720,7 @@ del "%~f0" & exit
         listbox = tk.Listbox(dialog)
         listbox.pack(expand=True, fill='both', padx=10, pady=5)
         
-        for b in backups:
-            listbox.insert(tk.END, b)
+        listbox.insert(tk.END, *backups)
             
         def do_restore():
             selection = listbox.curselection()
@@ -574,6 +747,8 @@ del "%~f0" & exit
         tk.Button(dialog, text="שחזר", command=do_restore).pack(pady=10)
 
     def reload_data(self):
+        self._versions['data'] += 1
+        self._bouquet_counts_cache.clear()
         self.flower_types = FlowersTypes()
         self.flower_colors = FlowerColors()
         self.load_default_prices()
@@ -738,15 +913,16 @@ del "%~f0" & exit
         if not hasattr(self, 'flowers_listbox'):
             return
         self.flowers_listbox.delete(0, tk.END)
-        self.displayed_flowers = sorted(self.flower_types.flowers)
+        self.displayed_flowers = self.flower_types.sorted_names()
+        items = []
         for f in self.displayed_flowers:
             config = self.flower_types.get_config(f)
             sizes = config.get('sizes', [])
             
             size_str = ",".join(sizes) if sizes else "הכל"
             
-            display_text = f"{f} (גדלים: {size_str})"
-            self.flowers_listbox.insert(tk.END, display_text)
+            items.append(f"{f} (גדלים: {size_str})")
+        self.flowers_listbox.insert(tk.END, *items)
 
     def add_flower(self):
         name = self.flower_entry.get().strip()
@@ -782,7 +958,7 @@ del "%~f0" & exit
         scrollbar = ttk.Scrollbar(list_frame)
         scrollbar.pack(side='right', fill='y')
         
-        self.colors_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set)
+        self.colors_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, selectmode=tk.EXTENDED)
         self.colors_listbox.pack(side='left', expand=True, fill='both')
         scrollbar.config(command=self.colors_listbox.yview)
         
@@ -806,8 +982,7 @@ del "%~f0" & exit
         if not hasattr(self, 'colors_listbox'):
             return
         self.colors_listbox.delete(0, tk.END)
-        for c in sorted(self.flower_colors.colors):
-            self.colors_listbox.insert(tk.END, c)
+        self.colors_listbox.insert(tk.END, *sorted(self.flower_colors.colors))
 
     def add_color(self):
         color = self.color_entry.get().strip()
@@ -823,9 +998,13 @@ del "%~f0" & exit
     def delete_color(self):
         selection = self.colors_listbox.curselection()
         if selection:
-            color = self.colors_listbox.get(selection[0])
-            if messagebox.askyesno("אישור", f"למחוק את הצבע '{color}'?"):
-                self.flower_colors.remove(color)
+            colors = [self.colors_listbox.get(i) for i in selection]
+            if len(colors) == 1:
+                prompt = f"למחוק את הצבע '{colors[0]}'?"
+            else:
+                prompt = f"למחוק {len(colors)} צבעים?"
+            if messagebox.askyesno("אישור", prompt):
+                self.flower_colors.remove_many(colors)
                 self.mark_dirty()
                 self.refresh_colors_list()
 
@@ -841,7 +1020,7 @@ del "%~f0" & exit
         scrollbar = ttk.Scrollbar(list_frame)
         scrollbar.pack(side='right', fill='y')
         
-        self.bouquets_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set)
+        self.bouquets_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, selectmode=tk.EXTENDED)
         self.bouquets_listbox.pack(side='left', expand=True, fill='both')
         self.bouquets_listbox.bind('<Double-1>', self.open_bouquet_editor)
         scrollbar.config(command=self.bouquets_listbox.yview)
@@ -892,6 +1071,7 @@ del "%~f0" & exit
             return
         self.bouquets_listbox.delete(0, tk.END)
         names = sorted(self.get_bouquet_names())
+        self._bouquet_names_sorted = names
         
         # Get mapping to highlight linked bouquets
         try:
@@ -980,7 +1160,12 @@ del "%~f0" & exit
                 b.save() # Save the new bouquet
                 self.mark_dirty()
                 self.bouquet_name_entry.delete(0, tk.END)
-                self.refresh_bouquets_list()
+                # New bouquets have no Wix link, so insert a single plain row instead of rebuilding the list
+                idx = bisect.bisect_left(self._bouquet_names_sorted, b.name)
+                self._bouquet_names_sorted.insert(idx, b.name)
+                self.bouquets_listbox.insert(idx, b.name)
+                self.based_on_combo.set("")
+                self.root.after_idle(self._sync_bouquet_combos)
                 # messagebox.showinfo("Success", f"Bouquet '{b.name}' created.")
             except ValueError as e:
                 messagebox.showerror("שגיאה", str(e))
@@ -989,13 +1174,25 @@ del "%~f0" & exit
         else:
             messagebox.showwarning("אזהרה", "נא להזין שם לזר.")
 
+    def _sync_bouquet_combos(self):
+        names = self._bouquet_names_sorted
+        self.based_on_combo['values'] = [""] + names
+        if hasattr(self, 'order_bouquet_combo'):
+            self.order_bouquet_combo['values'] = names
+            if not self.order_bouquet_combo.get():
+                self.order_bouquet_combo.current(0)
+
     def delete_bouquet(self):
         selection = self.bouquets_listbox.curselection()
         if selection:
-            name = self.bouquets_listbox.get(selection[0])
-            if messagebox.askyesno("אישור", f"למחוק את הזר '{name}'?"):
+            names = [self.bouquets_listbox.get(i) for i in selection]
+            if len(names) == 1:
+                prompt = f"למחוק את הזר '{names[0]}'?"
+            else:
+                prompt = f"למחוק {len(names)} זרים?"
+            if messagebox.askyesno("אישור", prompt):
                 try:
-                    Bouquet.delete_bouquet(name)
+                    Bouquet.delete_bouquets(names)
                     self.mark_dirty()
                     self.refresh_bouquets_list()
                 except Exception as e:
@@ -1027,6 +1224,16 @@ del "%~f0" & exit
         if not file_path:
             return
 
+        # Share one FlowerData per (name, color, size) across all loaded stems
+        flower_pool = {}
+
+        def intern_flower(f_name, f_color, f_size):
+            key = (f_name, f_color, f_size)
+            flower = flower_pool.get(key)
+            if flower is None:
+                flower = flower_pool[key] = FlowerData(f_name, f_color, f_size)
+            return flower
+
         try:
             new_bouquets = {}
             if file_path.lower().endswith('.xlsx'):
@@ -1048,15 +1255,14 @@ del "%~f0" & exit
                             f_color = row["Color"]
                             f_size = row["Size"]
                             count = int(row["Count"])
-                            flower = FlowerData(f_name, f_color, f_size)
+                            flower = intern_flower(f_name, f_color, f_size)
                             flowers.extend([flower] * count)
                         new_bouquets[name] = flowers
             elif file_path.lower().endswith('.json'):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    for name, flist in data.items():
-                        # flist is list of [name, color, size]
-                        new_bouquets[name] = [FlowerData(*f) for f in flist]
+                data = load_json_file(file_path)
+                for name, flist in data.items():
+                    # flist is list of [name, color, size]
+                    new_bouquets[name] = [intern_flower(*f) for f in flist]
             
             if new_bouquets:
                 # Merge with existing
@@ -1097,6 +1303,11 @@ del "%~f0" & exit
 
         editor = tk.Toplevel(self.root)
         editor.title(f"ערוך זר: {name}")
+
+        # Sort the catalog once per editor instead of on every selection
+        sorted_types = self.flower_types.sorted_names()
+        sorted_colors = sorted(self.flower_colors.colors)
+        sizes_default = self.flower_sizes.sizes
         # Auto-size to fit contents
         
         # Left: List of flowers
@@ -1111,12 +1322,24 @@ del "%~f0" & exit
         scrollbar.config(command=flowers_list.yview)
         
         current_display_items = []
+        cached_counts = None
+
+        def get_counts():
+            # Memoized bouquet.flower_count(); reset by invalidate_counts() on every mutation
+            nonlocal cached_counts
+            if cached_counts is None:
+                cached_counts = bouquet.flower_count()
+            return cached_counts
+
+        def invalidate_counts():
+            nonlocal cached_counts
+            cached_counts = None
 
         def refresh_list():
             nonlocal current_display_items
             flowers_list.delete(0, tk.END)
             current_display_items = []
-            counts = bouquet.flower_count()
+            counts = get_counts()
             for flower, count in counts.items():
                 flowers_list.insert(tk.END, f"{flower.name} - {flower.color} - {flower.size} (x{count})")
                 current_display_items.append(flower)
@@ -1132,15 +1355,15 @@ del "%~f0" & exit
         add_frame.pack(fill='x', pady=5)
         
         ttk.Label(add_frame, text="סוג:").pack(anchor='w', padx=5)
-        type_combo = ttk.Combobox(add_frame, values=sorted(self.flower_types.flowers), state="readonly")
+        type_combo = ttk.Combobox(add_frame, values=sorted_types, state="readonly")
         type_combo.pack(fill='x', padx=5, pady=2)
         
         ttk.Label(add_frame, text="צבע:").pack(anchor='w', padx=5)
-        color_combo = ttk.Combobox(add_frame, values=sorted(self.flower_colors.colors), state="readonly")
+        color_combo = ttk.Combobox(add_frame, values=sorted_colors, state="readonly")
         color_combo.pack(fill='x', padx=5, pady=2)
         
         ttk.Label(add_frame, text="גודל:").pack(anchor='w', padx=5)
-        size_combo = ttk.Combobox(add_frame, values=self.flower_sizes.sizes, state="readonly")
+        size_combo = ttk.Combobox(add_frame, values=sizes_default, state="readonly")
         size_combo.pack(fill='x', padx=5, pady=2)
         
         def update_add_combos(event=None):
@@ -1150,12 +1373,10 @@ del "%~f0" & exit
             config = self.flower_types.get_config(f_name)
             valid_sizes = config.get('sizes', [])
             
-            # Colors are now unrestricted per flower type
-            valid_colors = sorted(self.flower_colors.colors)
+            if not valid_sizes: valid_sizes = sizes_default
             
-            if not valid_sizes: valid_sizes = self.flower_sizes.sizes
-            
-            color_combo['values'] = valid_colors
+            # Colors are now unrestricted per flower type
+            color_combo['values'] = sorted_colors
             size_combo['values'] = valid_sizes
             
             color_combo.set('')
@@ -1180,6 +1401,7 @@ del "%~f0" & exit
             if f_name and f_color and f_size:
                 flower = FlowerData(f_name, f_color, f_size)
                 bouquet.select_flower(flower, count)
+                invalidate_counts()
                 refresh_list()
             else:
                 messagebox.showwarning("אזהרה", "נא לבחור סוג, צבע וגודל.")
@@ -1192,6 +1414,7 @@ del "%~f0" & exit
                 idx = selection[0]
                 flower = current_display_items[idx]
                 bouquet.remove_flower(flower, count=1)
+                invalidate_counts()
                 refresh_list()
         
         ttk.Button(controls_frame, text="הסר נבחרים (1)", command=remove_flower_action).pack(fill='x', pady=5)
@@ -1222,7 +1445,7 @@ del "%~f0" & exit
                 messagebox.showwarning("אזהרה", "הכמות חייבת להיות לפחות 1.")
                 return
 
-            current_counts = bouquet.flower_count()
+            current_counts = get_counts()
             current_qty = current_counts.get(flower, 0)
             
             if new_qty > current_qty:
@@ -1230,6 +1453,7 @@ del "%~f0" & exit
             elif new_qty < current_qty:
                 bouquet.remove_flower(flower, count=current_qty - new_qty)
             
+            invalidate_counts()
             refresh_list()
             
         ttk.Button(edit_frame, text="עדכן", command=update_quantity).pack(side='left', fill='x', expand=True, padx=5, pady=5)
@@ -1239,11 +1463,11 @@ del "%~f0" & exit
         edit_details_frame.pack(fill='x', pady=5)
         
         ttk.Label(edit_details_frame, text="צבע:").pack(anchor='w', padx=5)
-        edit_color_combo = ttk.Combobox(edit_details_frame, values=sorted(self.flower_colors.colors), state="readonly")
+        edit_color_combo = ttk.Combobox(edit_details_frame, values=sorted_colors, state="readonly")
         edit_color_combo.pack(fill='x', padx=5, pady=2)
         
         ttk.Label(edit_details_frame, text="גודל:").pack(anchor='w', padx=5)
-        edit_size_combo = ttk.Combobox(edit_details_frame, values=self.flower_sizes.sizes, state="readonly")
+        edit_size_combo = ttk.Combobox(edit_details_frame, values=sizes_default, state="readonly")
         edit_size_combo.pack(fill='x', padx=5, pady=2)
         
         def update_details():
@@ -1269,7 +1493,7 @@ del "%~f0" & exit
             new_flower = FlowerData(old_flower.name, new_color, new_size)
             
             # Get count
-            counts = bouquet.flower_count()
+            counts = get_counts()
             count = counts.get(old_flower, 0)
             
             # Remove old
@@ -1278,6 +1502,7 @@ del "%~f0" & exit
             # Add new
             bouquet.select_flower(new_flower, count)
             
+            invalidate_counts()
             refresh_list()
             
         ttk.Button(edit_details_frame, text="עדכן פרטים", command=update_details).pack(fill='x', padx=5, pady=5)
@@ -1296,8 +1521,7 @@ del "%~f0" & exit
                 wix_frame.pack(fill='x', pady=5)
                 
                 def open_wix_product():
-                    site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-                    url = f"https://manage.wix.com/dashboard/{site_id}/store/products/{linked_wix_id}"
+                    url = f"https://manage.wix.com/dashboard/{WIX_SITE_ID}/store/products/{linked_wix_id}"
                     webbrowser.open(url)
                     
                 def unlock_wix():
@@ -1314,12 +1538,16 @@ del "%~f0" & exit
         except Exception as e:
             print(f"Error checking Wix link: {e}")
 
+        # Last size list pushed to the edit combo, so an unchanged list skips the Tcl round-trip
+        last_edit_size_values = sizes_default
+
         def on_flower_select(event):
+            nonlocal last_edit_size_values
             selection = flowers_list.curselection()
             if selection:
                 idx = selection[0]
                 flower = current_display_items[idx]
-                counts = bouquet.flower_count()
+                counts = get_counts()
                 qty = counts.get(flower, 0)
                 edit_qty_spin.set(qty)
                 
@@ -1327,13 +1555,12 @@ del "%~f0" & exit
                 config = self.flower_types.get_config(flower.name)
                 valid_sizes = config.get('sizes', [])
                 
-                # Colors are unrestricted
-                valid_colors = sorted(self.flower_colors.colors)
+                if not valid_sizes: valid_sizes = sizes_default
                 
-                if not valid_sizes: valid_sizes = self.flower_sizes.sizes
-                
-                edit_color_combo['values'] = valid_colors
-                edit_size_combo['values'] = valid_sizes
+                # Colors are unrestricted (the combo is built with sorted_colors)
+                if valid_sizes != last_edit_size_values:
+                    edit_size_combo['values'] = valid_sizes
+                    last_edit_size_values = valid_sizes
                 
                 # Set combos
                 edit_color_combo.set(flower.color)
@@ -1407,20 +1634,41 @@ del "%~f0" & exit
         self.order_listbox.bind('<<ListboxSelect>>', self.on_order_select)
         scrollbar.config(command=self.order_listbox.yview)
         
+    def mark_category_tabs_stale(self):
+        """
+        Flag every Wix category tab for a reload the next time it is selected.
+        The selected tab is reloaded right away only if it is actually on screen.
+        """
+        for frame in self.category_tabs.values():
+            frame.needs_reload = True
+        cid = self.tab_to_cid.get(self.right_notebook.select())
+        if cid is not None and self.category_tabs[cid].winfo_viewable():
+            self.load_products_for_tab(cid, silent=True)
+
     def on_tab_change(self, event):
         # Check if the selected tab is "Order"
         try:
             notebook = event.widget
             selected_tab = notebook.select()
+            # Wix category tabs flagged by lock/unlock reload on first view
+            cid = self.tab_to_cid.get(selected_tab)
+            if cid is not None:
+                if getattr(self.category_tabs[cid], 'needs_reload', False):
+                    self.load_products_for_tab(cid, silent=True)
+                return
             tab_text = notebook.tab(selected_tab, "text")
             if tab_text == "הזמנה":
-                self.refresh_order_bouquets()
+                if self._tab_needs_refresh(tab_text):
+                    self.refresh_order_bouquets()
             elif tab_text == "כמויות":
-                self.refresh_quantities()
+                if self._tab_needs_refresh(tab_text):
+                    self.refresh_quantities()
             elif tab_text == "תמחור הזמנה":
-                self.refresh_order_pricing_tab()
+                if self._tab_needs_refresh(tab_text):
+                    self.refresh_order_pricing_tab()
             elif tab_text == "מחירון":
-                self.refresh_global_pricing_tab()
+                if self._tab_needs_refresh(tab_text):
+                    self.refresh_global_pricing_tab()
             elif tab_text == "זרים":
                 # Ensure we have the latest visual state
                 self.refresh_bouquets_list()
@@ -1449,11 +1697,7 @@ del "%~f0" & exit
             
         if bouquet_name and qty > 0:
             # Check if already exists
-            found_index = -1
-            for i, (name, current_qty) in enumerate(self.current_order):
-                if name == bouquet_name:
-                    found_index = i
-                    break
+            found_index = self._order_index.get(bouquet_name, -1)
             
             if found_index != -1:
                 # Update existing
@@ -1463,10 +1707,13 @@ del "%~f0" & exit
                 # Update listbox
                 self.order_listbox.delete(found_index)
                 self.order_listbox.insert(found_index, f"{bouquet_name} (x{new_total_qty})")
+                self.mark_order_changed()
             else:
                 # Add new
                 self.order_listbox.insert(tk.END, f"{bouquet_name} (x{qty})")
+                self._order_index[bouquet_name] = len(self.current_order)
                 self.current_order.append((bouquet_name, qty))
+                self.mark_order_changed()
         else:
             messagebox.showwarning("אזהרה", "נא לבחור זר וכמות חוקית.")
 
@@ -1476,6 +1723,13 @@ del "%~f0" & exit
             idx = selection[0]
             self.order_listbox.delete(idx)
             del self.current_order[idx]
+            self._rebuild_order_index()
+            self.mark_order_changed()
+
+    def _rebuild_order_index(self):
+        self._order_index = {}
+        for i, (name, _) in enumerate(self.current_order):
+            self._order_index.setdefault(name, i)
 
     def on_order_select(self, event):
         selection = self.order_listbox.curselection()
@@ -1504,6 +1758,7 @@ del "%~f0" & exit
                 
             if new_qty > 0:
                 self.current_order[idx] = (bouquet_name, new_qty)
+                self.mark_order_changed()
                 self.order_listbox.delete(idx)
                 self.order_listbox.insert(idx, f"{bouquet_name} (x{new_qty})")
                 self.order_listbox.selection_set(idx)
@@ -1545,19 +1800,19 @@ del "%~f0" & exit
                 order_data.append({"Bouquet Name": b_name, "Quantity": qty})
             df_order = pd.DataFrame(order_data)
             
-            with pd.ExcelWriter(filepath) as writer:
+            with excel_writer(filepath) as writer:
                 df_order.to_excel(writer, sheet_name="Order", index=False)
                 
                 # Sheet 2: Quantities (Report)
-                total_flowers = defaultdict(int)
+                # Load the bouquets file once instead of once per order line
+                all_bouquets = load_all_bouquets()
+                total_flowers = Counter()
                 for bouquet_name, qty in self.current_order:
-                    try:
-                        b = Bouquet(bouquet_name, load_existing=True)
-                        counts = b.flower_count()
-                        for flower, count in counts.items():
-                            total_flowers[flower] += count * qty
-                    except Exception as e:
-                        print(f"Error loading bouquet {bouquet_name}: {e}")
+                    counts = Counter(all_bouquets.get(bouquet_name, []))
+                    if qty == 1:
+                        total_flowers.update(counts)
+                    else:
+                        total_flowers.update({flower: count * qty for flower, count in counts.items()})
                 
                 qty_data = []
                 sorted_flowers = sorted(total_flowers.items(), key=lambda x: x[0].name)
@@ -1575,47 +1830,27 @@ del "%~f0" & exit
                     pd.DataFrame({"Message": ["No quantities"]}).to_excel(writer, sheet_name="Quantities", index=False)
 
                 # Sheet 4: Pricing (Report)
-                pricing_data = []
+                # Rows go straight into the worksheet instead of through a DataFrame
+                append_pricing_row = sheet_row_writer(
+                    writer, "Pricing", ["Flower", "Color", "Size", "Quantity", "Unit Price", "Total Price"])
+
                 grand_total_price = 0.0
+                current_prices_get = self.current_prices.get
+                default_prices_get = self.default_prices.get
                 
                 for flower, count in sorted_flowers:
-                    flower_key = f"{flower.name} - {flower.color} - {flower.size}"
-                    
-                    # Determine price
-                    price = 0.0
-                    if flower_key in self.current_prices:
-                        price = self.current_prices[flower_key]
-                    else:
-                        default_key = f"{flower.name} - {flower.size}"
-                        if default_key in self.default_prices:
-                            price = self.default_prices[default_key]
+                    # Determine price: Order Specific > Default (Name-Size) > 0
+                    price = current_prices_get(price_key(flower.name, flower.color, flower.size))
+                    if price is None:
+                        price = default_prices_get(default_price_key(flower.name, flower.size), 0.0)
                     
                     total_line_price = price * count
                     grand_total_price += total_line_price
                     
-                    pricing_data.append({
-                        "Flower": flower.name,
-                        "Color": flower.color,
-                        "Size": flower.size,
-                        "Quantity": count,
-                        "Unit Price": price,
-                        "Total Price": total_line_price
-                    })
+                    append_pricing_row([flower.name, flower.color, flower.size, count, price, total_line_price])
                 
                 # Add Grand Total row
-                pricing_data.append({
-                    "Flower": "GRAND TOTAL",
-                    "Color": "",
-                    "Size": "",
-                    "Quantity": "",
-                    "Unit Price": "",
-                    "Total Price": grand_total_price
-                })
-
-                if pricing_data:
-                    pd.DataFrame(pricing_data).to_excel(writer, sheet_name="Pricing", index=False)
-                else:
-                    pd.DataFrame({"Message": ["No pricing data"]}).to_excel(writer, sheet_name="Pricing", index=False)
+                append_pricing_row(["GRAND TOTAL", "", "", "", "", grand_total_price])
 
             messagebox.showinfo("הצלחה", f"ההזמנה נשמרה ב-{filepath}")
         except Exception as e:
@@ -1628,14 +1863,16 @@ del "%~f0" & exit
             messagebox.showinfo("מידע", "לא נמצאו הזמנות.")
             return
 
-        # Get list of xlsx files (and json for backward compat)
-        files = [f for f in os.listdir(orders_dir) if f.endswith('.xlsx') or f.endswith('.json')]
-        if not files:
+        # Get list of xlsx files (and json for backward compat) with their mtimes in one directory pass
+        with os.scandir(orders_dir) as it:
+            entries = [(e.name, e.stat().st_mtime) for e in it
+                       if e.is_file() and (e.name.endswith('.xlsx') or e.name.endswith('.json'))]
+        if not entries:
             messagebox.showinfo("מידע", "לא נמצאו הזמנות.")
             return
             
-        files.sort(key=lambda x: os.path.getmtime(os.path.join(orders_dir, x)), reverse=True)
-        recent_files = files[:10]
+        entries.sort(key=lambda t: t[1], reverse=True)
+        recent_files = [name for name, _ in entries[:10]]
 
         # Create selection window
         dialog = tk.Toplevel(self.root)
@@ -1647,8 +1884,7 @@ del "%~f0" & exit
         listbox = tk.Listbox(dialog, exportselection=False)
         listbox.pack(expand=True, fill='both', padx=10, pady=5)
         
-        for f in recent_files:
-            listbox.insert(tk.END, f)
+        listbox.insert(tk.END, *recent_files)
             
         def do_load():
             selection = listbox.curselection()
@@ -1679,31 +1915,44 @@ del "%~f0" & exit
                     # Validate data format (list of [name, qty])
                     if isinstance(loaded_order, list) and all(isinstance(item, list) and len(item) == 2 for item in loaded_order):
                         self.current_order = [tuple(item) for item in loaded_order]
+                        self._rebuild_order_index()
+                        self.mark_order_changed()
                         self.current_prices = loaded_prices
                         self.order_listbox.delete(0, tk.END)
-                        for name, qty in self.current_order:
-                            self.order_listbox.insert(tk.END, f"{name} (x{qty})")
+                        self.order_listbox.insert(tk.END, *(f"{name} (x{qty})" for name, qty in self.current_order))
                     else:
                         messagebox.showerror("שגיאה", "Invalid order file format.")
                 else:
-                    # Excel load
-                    df_order = pd.read_excel(filepath, sheet_name="Order")
-                    self.current_order = []
-                    for _, row in df_order.iterrows():
-                        self.current_order.append((row["Bouquet Name"], int(row["Quantity"])))
+                    # Excel load - open the workbook once for both sheets
+                    with pd.ExcelFile(filepath, engine="openpyxl") as xl:
+                        df_order = xl.parse("Order", usecols=["Bouquet Name", "Quantity"],
+                                            dtype={"Bouquet Name": "string", "Quantity": "int64"})
+                        df_prices = None
+                        if "Prices" in xl.sheet_names:
+                            price_cols = ["Flower Name", "Color", "Size", "Price"]
+                            df_prices = xl.parse("Prices", usecols=lambda col: col in price_cols,
+                                                 dtype={"Flower Name": "string", "Color": "string",
+                                                        "Size": "string", "Price": "float64"})
+                            # An empty or partial Prices sheet just means no order-specific prices
+                            if not all(col in df_prices.columns for col in price_cols):
+                                df_prices = None
+                    
+                    names = df_order["Bouquet Name"].tolist()
+                    qtys = df_order["Quantity"].to_numpy(dtype="int64", copy=False).tolist()
+                    self.current_order = list(zip(names, qtys))
+                    self._rebuild_order_index()
+                    self.mark_order_changed()
                     
                     self.current_prices = {}
-                    try:
-                        df_prices = pd.read_excel(filepath, sheet_name="Prices")
-                        for _, row in df_prices.iterrows():
-                            key = f"{row['Flower Name']} - {row['Color']} - {row['Size']}"
-                            self.current_prices[key] = float(row['Price'])
-                    except:
-                        pass # Prices sheet might not exist or be empty
+                    if df_prices is not None:
+                        # Columns are already read as strings, so the key join stays vectorized
+                        keys = df_prices["Flower Name"].str.cat(
+                            [df_prices["Color"], df_prices["Size"]], sep=" - ", na_rep="").tolist()
+                        prices = df_prices["Price"].to_numpy(dtype="float64", copy=False).tolist()
+                        self.current_prices = dict(zip(keys, prices))
                     
                     self.order_listbox.delete(0, tk.END)
-                    for name, qty in self.current_order:
-                        self.order_listbox.insert(tk.END, f"{name} (x{qty})")
+                    self.order_listbox.insert(tk.END, *(f"{name} (x{qty})" for name, qty in self.current_order))
 
             except Exception as e:
                 messagebox.showerror("שגיאה", f"נכשל בטעינת ההזמנה: {e}")
@@ -1733,32 +1982,39 @@ del "%~f0" & exit
         self.total_flowers_label = ttk.Label(frame, text="סה\"כ פרחים: 0")
         self.total_flowers_label.pack(pady=5)
 
-    def refresh_quantities(self):
-        self.quantities_listbox.delete(0, tk.END)
+    def _get_bouquet_counts(self, bouquet_name):
+        counts = self._bouquet_counts_cache.get(bouquet_name)
+        if counts is None:
+            counts = Bouquet(bouquet_name, load_existing=True).flower_count()
+            self._bouquet_counts_cache[bouquet_name] = counts
+        return counts
+
+    def _compute_order_totals(self):
+        # Aggregate flower counts over the whole order, shared by the quantities and pricing tabs
         total_flowers = defaultdict(int)
-        grand_total = 0
-        
         for bouquet_name, qty in self.current_order:
             try:
-                b = Bouquet(bouquet_name, load_existing=True)
-                counts = b.flower_count()
+                counts = self._get_bouquet_counts(bouquet_name)
                 for flower, count in counts.items():
-                    total_count = count * qty
-                    total_flowers[flower] += total_count
-                    grand_total += total_count
+                    total_flowers[flower] += count * qty
             except Exception as e:
                 print(f"Error loading bouquet {bouquet_name}: {e}")
+        return total_flowers
+
+    def refresh_quantities(self):
+        self.quantities_listbox.delete(0, tk.END)
+        total_flowers = self._compute_order_totals()
+        grand_total = sum(total_flowers.values())
                 
         # Sort by flower name
         sorted_flowers = sorted(total_flowers.items(), key=lambda x: x[0].name)
         
-        for flower, count in sorted_flowers:
-            self.quantities_listbox.insert(tk.END, f"{flower.name} - {flower.color} - {flower.size}: {count}")
+        # One Tcl call for all rows
+        self.quantities_listbox.insert(tk.END, *(f"{price_key(flower.name, flower.color, flower.size)}: {count}"
+                                                 for flower, count in sorted_flowers))
             
         self.total_flowers_label.config(text=f"סה\"כ פרחים: {grand_total}")
 
-        self.total_flowers_label.config(text=f"סה\"כ פרחים: {grand_total}")
-
     def create_order_pricing_tab(self):
         frame = ttk.Frame(self.left_notebook)
         img = self.create_tab_image('gold')
@@ -1774,14 +2030,10 @@ del "%~f0" & exit
         # Scrollable Area
         canvas = tk.Canvas(frame)
         scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
+        self.order_pricing_canvas = canvas
         self.order_pricing_scrollable_frame = ttk.Frame(canvas)
         
-        self.order_pricing_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
+        self.order_pricing_scrollable_frame.bind("<Configure>", self._on_pricing_configure)
         
         canvas.create_window((0, 0), window=self.order_pricing_scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
@@ -1794,88 +2046,129 @@ del "%~f0" & exit
         self.total_price_label.pack(pady=10)
 
     def refresh_order_pricing_tab(self):
-        # Clear existing rows
-        for widget in self.order_pricing_scrollable_frame.winfo_children():
-            widget.destroy()
-            
-        total_flowers = defaultdict(int)
-        
         # Calculate totals
-        for bouquet_name, qty in self.current_order:
-            try:
-                b = Bouquet(bouquet_name, load_existing=True)
-                counts = b.flower_count()
-                for flower, count in counts.items():
-                    total_count = count * qty
-                    total_flowers[flower] += total_count
-            except Exception as e:
-                print(f"Error loading bouquet {bouquet_name}: {e}")
+        total_flowers = self._compute_order_totals()
         
         sorted_flowers = sorted(total_flowers.items(), key=lambda x: x[0].name)
         
-        grand_total_price = 0.0
+        # Running totals so a price edit only adjusts its own row
+        self._row_subtotal = {}
+        self._grand_total_price = 0.0
+        current_prices_get = self.current_prices.get
+        default_prices_get = self.default_prices.get
         
-        for flower, count in sorted_flowers:
-            flower_key = f"{flower.name} - {flower.color} - {flower.size}"
-            
-            row_frame = ttk.Frame(self.order_pricing_scrollable_frame)
-            row_frame.pack(fill='x', pady=2)
-            
-            ttk.Label(row_frame, text=flower_key, width=40).pack(side='left', padx=5)
-            ttk.Label(row_frame, text=str(count), width=10).pack(side='left', padx=5)
+        # Row widgets are pooled and relabelled instead of destroyed/recreated on every refresh
+        for i, (flower, count) in enumerate(sorted_flowers):
+            flower_key = price_key(flower.name, flower.color, flower.size)
+            default_key = default_price_key(flower.name, flower.size)
             
-            price_var = tk.StringVar()
-            
-            # Determine price: Order Specific > Default (Name-Size) > 0
-            current_price = 0.0
-            if flower_key in self.current_prices:
-                current_price = self.current_prices[flower_key]
+            if i < len(self._order_pricing_rows):
+                row = self._order_pricing_rows[i]
             else:
-                default_key = f"{flower.name} - {flower.size}"
-                if default_key in self.default_prices:
-                    current_price = self.default_prices[default_key]
-            
-            price_var.set(str(current_price))
-            grand_total_price += float(current_price) * count
+                row = self._create_order_pricing_row()
+                self._order_pricing_rows.append(row)
             
-            entry = ttk.Entry(row_frame, textvariable=price_var, width=15)
-            entry.pack(side='left', padx=5)
-            
-            # Bind trace to update total price and save to current_prices
-            def on_price_change(var, key=flower_key, cnt=count):
-                try:
-                    val = var.get()
-                    if val:
-                        price = float(val)
-                        self.current_prices[key] = price
-                    else:
-                        if key in self.current_prices:
-                            del self.current_prices[key]
-                    self.update_total_price(total_flowers)
-                except ValueError:
-                    pass # Ignore invalid input
-            
-            # Use trace_add instead of trace for newer tkinter, but trace is safer for older
-            price_var.trace("w", lambda name, index, mode, v=price_var, k=flower_key, c=count: on_price_change(v, k, c))
-            
-        self.total_price_label.config(text=f"סה\"כ מחיר: {grand_total_price:.2f}")
-
-    def update_total_price(self, total_flowers):
-        grand_total = 0.0
-        for flower, count in total_flowers.items():
-            flower_key = f"{flower.name} - {flower.color} - {flower.size}"
-            
-            # Priority: Order Specific > Default (Name-Size) > 0
-            price = 0.0
-            if flower_key in self.current_prices:
-                price = self.current_prices[flower_key]
+            # Determine price: Order Specific > Default (Name-Size) > 0
+            current_price = current_prices_get(flower_key)
+            if current_price is None:
+                current_price = default_prices_get(default_key, 0.0)
+            
+            # Detach the row while its entry is reset so the trace doesn't fire for it
+            row['key'] = None
+            row['var'].set(str(current_price))
+            row['key'] = flower_key
+            row['default_key'] = default_key
+            row['count'] = count
+            row['key_label'].config(text=flower_key)
+            row['count_label'].config(text=str(count))
+            if not row['visible']:
+                row['frame'].pack(fill='x', pady=2)
+                row['visible'] = True
+            
+            subtotal = float(current_price) * count
+            self._row_subtotal[flower_key] = subtotal
+            self._grand_total_price += subtotal
+        
+        # Hide rows left over from a larger previous order
+        for row in self._order_pricing_rows[len(sorted_flowers):]:
+            if row['visible']:
+                row['key'] = None
+                row['frame'].pack_forget()
+                row['visible'] = False
+            
+        self.update_total_price_label()
+
+    def _create_order_pricing_row(self):
+        row_frame = ttk.Frame(self.order_pricing_scrollable_frame)
+        key_label = ttk.Label(row_frame, width=40)
+        key_label.pack(side='left', padx=5)
+        count_label = ttk.Label(row_frame, width=10)
+        count_label.pack(side='left', padx=5)
+        
+        price_var = tk.StringVar()
+        entry = ttk.Entry(row_frame, textvariable=price_var, width=15)
+        entry.pack(side='left', padx=5)
+        
+        row = {'frame': row_frame, 'key_label': key_label, 'count_label': count_label,
+               'var': price_var, 'key': None, 'default_key': None, 'count': 0, 'visible': False}
+        
+        # Bind trace to update total price and save to current_prices.
+        # All rows share one handler that finds its row by Tcl variable name,
+        # and it reads the row's current key, so it survives the row being reused.
+        self._price_rows_by_var[str(price_var)] = row
+        price_var.trace_add("write", self._on_order_price_change)
+        return row
+
+    def _on_order_price_change(self, var_name, index, mode):
+        row = self._price_rows_by_var.get(var_name)
+        if row is None:
+            return
+        key = row['key']
+        if key is None:
+            return
+        try:
+            val = row['var'].get()
+            if val:
+                price = float(val)
+                self.current_prices[key] = price
             else:
-                default_key = f"{flower.name} - {flower.size}"
-                if default_key in self.default_prices:
-                    price = self.default_prices[default_key]
-                
-            grand_total += price * count
-        self.total_price_label.config(text=f"סה\"כ מחיר: {grand_total:.2f}")
+                if key in self.current_prices:
+                    del self.current_prices[key]
+                price = self.default_prices.get(row['default_key'], 0.0)
+            new_subtotal = price * row['count']
+            self._grand_total_price += new_subtotal - self._row_subtotal.get(key, 0.0)
+            self._row_subtotal[key] = new_subtotal
+            self.schedule_total_price_update()
+        except ValueError:
+            pass # Ignore invalid input
+
+    def _schedule_scrollregion_update(self, canvas):
+        # Rows packed during a refresh each fire <Configure>; recompute bbox("all") once afterwards
+        if canvas in self._pending_scrollregion:
+            return
+        self._pending_scrollregion.add(canvas)
+
+        def update():
+            self._pending_scrollregion.discard(canvas)
+            canvas.configure(scrollregion=canvas.bbox("all"))
+        self.root.after_idle(update)
+
+    def _on_pricing_configure(self, event):
+        self._schedule_scrollregion_update(self.order_pricing_canvas)
+
+    def _on_global_pricing_configure(self, event):
+        self._schedule_scrollregion_update(self.global_pricing_canvas)
+
+    def schedule_total_price_update(self):
+        # Coalesce label updates while typing fast
+        if self._total_price_after_id is None:
+            self._total_price_after_id = self.root.after(50, self.update_total_price_label)
+
+    def update_total_price_label(self):
+        if self._total_price_after_id is not None:
+            self.root.after_cancel(self._total_price_after_id)
+            self._total_price_after_id = None
+        self.total_price_label.config(text=f"סה\"כ מחיר: {self._grand_total_price:.2f}")
 
     def create_global_pricing_tab(self):
         frame = ttk.Frame(self.right_notebook)
@@ -1903,14 +2196,10 @@ del "%~f0" & exit
         # Scrollable Area
         canvas = tk.Canvas(frame)
         scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
+        self.global_pricing_canvas = canvas
         self.global_pricing_scrollable_frame = ttk.Frame(canvas)
         
-        self.global_pricing_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
+        self.global_pricing_scrollable_frame.bind("<Configure>", self._on_global_pricing_configure)
         
         # Ensure the inner frame expands to fill the canvas width
         canvas.bind('<Configure>', lambda e: canvas.itemconfig(window_id, width=e.width))
@@ -1925,29 +2214,24 @@ del "%~f0" & exit
         timestamp = datetime.now().strftime("%d_%m_%Y")
         filename = f"DefaultPricing_{timestamp}.xlsx"
         
-        data = []
-        # Iterate through all defined flowers to ensure complete list
-        for f_name in sorted(self.flower_types.flowers):
-            config = self.flower_types.get_config(f_name)
-            valid_sizes = config.get('sizes', [])
-            
-            # If no specific sizes defined, use all available sizes
-            if not valid_sizes:
-                valid_sizes = self.flower_sizes.sizes
-                
-            for f_size in valid_sizes:
-                key = f"{f_name} - {f_size}"
-                price = self.default_prices.get(key, 0.0)
-                
-                data.append({
-                    "Flower Name": f_name,
-                    "Size": f_size,
-                    "Price": price
-                })
-        
-        df = pd.DataFrame(data, columns=["Flower Name", "Size", "Price"])
         try:
-            df.to_excel(filename, index=False)
+            # Rows are written straight to the sheet instead of collected into a DataFrame
+            with excel_writer(filename, rows_in_order=True) as writer:
+                append_row = sheet_row_writer(writer, "Sheet1", ["Flower Name", "Size", "Price"])
+                
+                # Iterate through all defined flowers to ensure complete list
+                for f_name in self.flower_types.sorted_names():
+                    config = self.flower_types.get_config(f_name)
+                    valid_sizes = config.get('sizes', [])
+                    
+                    # If no specific sizes defined, use all available sizes
+                    if not valid_sizes:
+                        valid_sizes = self.flower_sizes.sizes
+                        
+                    for f_size in valid_sizes:
+                        price = self.default_prices.get(default_price_key(f_name, f_size), 0.0)
+                        append_row([f_name, f_size, price])
+            
             self.mark_dirty()
             messagebox.showinfo("הצלחה", f"המחירים נשמרו בקובץ '{filename}'")
         except Exception as e:
@@ -1964,23 +2248,19 @@ del "%~f0" & exit
         try:
             new_prices = {}
             if file_path.lower().endswith('.xlsx'):
-                df = pd.read_excel(file_path)
                 # Expected columns: Flower Name, Size, Price
-                
                 required_cols = ["Flower Name", "Size", "Price"]
-                # Check if columns exist
+                df = pd.read_excel(file_path, engine="openpyxl",
+                                   usecols=lambda col: col in required_cols,
+                                   dtype=DEFAULT_PRICES_DTYPES)
+                
+                # Check if columns exist (a legacy Color column is simply ignored)
                 if all(col in df.columns for col in required_cols):
-                    for _, row in df.iterrows():
-                        key = f"{row['Flower Name']} - {row['Size']}"
-                        new_prices[key] = float(row['Price'])
+                    keys = df["Flower Name"].str.cat(df["Size"], sep=" - ", na_rep="").tolist()
+                    prices = df["Price"].to_numpy(dtype="float64", copy=False).tolist()
+                    new_prices = dict(zip(keys, prices))
                 else:
-                     # Try legacy format with Color?
-                     if "Color" in df.columns and "Flower Name" in df.columns and "Size" in df.columns and "Price" in df.columns:
-                         for _, row in df.iterrows():
-                            key = f"{row['Flower Name']} - {row['Size']}"
-                            new_prices[key] = float(row['Price'])
-                     else:
-                         raise ValueError(f"חסרות עמודות בקובץ Excel. נדרש: {', '.join(required_cols)}")
+                    raise ValueError(f"חסרות עמודות בקובץ Excel. נדרש: {', '.join(required_cols)}")
 
             elif file_path.lower().endswith('.json'):
                 with open(file_path, "r", encoding="utf-8") as f:
@@ -2018,6 +2298,7 @@ del "%~f0" & exit
                         self.refresh_flowers_list()
 
                 self.default_prices.update(new_prices)
+                self._versions['data'] += 1
                 self.save_default_prices()
                 self.refresh_global_pricing_tab()
                 
@@ -2035,13 +2316,10 @@ del "%~f0" & exit
     def refresh_global_pricing_tab(self):
         if not hasattr(self, 'global_pricing_scrollable_frame'):
             return
-        # Clear existing rows
-        for widget in self.global_pricing_scrollable_frame.winfo_children():
-            widget.destroy()
             
         # Generate all combinations of existing flowers and sizes (ignoring colors)
         all_combinations = []
-        for f_name in sorted(self.flower_types.flowers):
+        for f_name in self.flower_types.sorted_names():
             config = self.flower_types.get_config(f_name)
             valid_sizes = config.get('sizes', [])
             
@@ -2050,42 +2328,96 @@ del "%~f0" & exit
             for f_size in valid_sizes:
                 all_combinations.append(f"{f_name} - {f_size}")
         
-        for flower_key in all_combinations:
-            row_frame = ttk.Frame(self.global_pricing_scrollable_frame)
-            row_frame.pack(fill='x', pady=2)
-            
-            ttk.Label(row_frame, text=flower_key, width=40).pack(side='left', padx=5)
-            
-            price_var = tk.StringVar()
-            if flower_key in self.default_prices:
-                price_var.set(str(self.default_prices[flower_key]))
-            
-            entry = ttk.Entry(row_frame, textvariable=price_var, width=15)
-            entry.pack(side='left', padx=5)
-            
-            def on_default_price_change(var, key=flower_key):
-                try:
-                    val = var.get()
-                    if val:
-                        self.default_prices[key] = float(val)
-                        self.mark_dirty() # Mark dirty on change
-                    else:
-                        if key in self.default_prices:
-                            del self.default_prices[key]
-                            self.mark_dirty()
-                except ValueError:
-                    pass
-            
-            price_var.trace("w", lambda name, index, mode, v=price_var, k=flower_key: on_default_price_change(v, k))
+        # Reuse pooled rows, same as the order pricing tab
+        for i, flower_key in enumerate(all_combinations):
+            if i < len(self._global_pricing_rows):
+                row = self._global_pricing_rows[i]
+            else:
+                row = self._create_global_pricing_row()
+                self._global_pricing_rows.append(row)
+            
+            row['key'] = None
+            row['var'].set(str(self.default_prices[flower_key]) if flower_key in self.default_prices else "")
+            row['key'] = flower_key
+            row['key_label'].config(text=flower_key)
+            if not row['visible']:
+                row['frame'].pack(fill='x', pady=2)
+                row['visible'] = True
+        
+        for row in self._global_pricing_rows[len(all_combinations):]:
+            if row['visible']:
+                row['key'] = None
+                row['frame'].pack_forget()
+                row['visible'] = False
+
+    def _create_global_pricing_row(self):
+        row_frame = ttk.Frame(self.global_pricing_scrollable_frame)
+        key_label = ttk.Label(row_frame, width=40)
+        key_label.pack(side='left', padx=5)
+        
+        price_var = tk.StringVar()
+        entry = ttk.Entry(row_frame, textvariable=price_var, width=15)
+        entry.pack(side='left', padx=5)
+        
+        row = {'frame': row_frame, 'key_label': key_label, 'var': price_var, 'key': None, 'visible': False}
+        self._price_rows_by_var[str(price_var)] = row
+        price_var.trace_add("write", self._on_default_price_change)
+        return row
+
+    def _on_default_price_change(self, var_name, index, mode):
+        row = self._price_rows_by_var.get(var_name)
+        if row is None:
+            return
+        key = row['key']
+        if key is None:
+            return
+        try:
+            val = row['var'].get()
+            if val:
+                self.default_prices[key] = float(val)
+                self.mark_dirty() # Mark dirty on change
+            else:
+                if key in self.default_prices:
+                    del self.default_prices[key]
+                    self.mark_dirty()
+        except ValueError:
+            pass
+
+    def _get_wix_token(self):
+        # wix_token.json is parsed once and re-read only when its mtime changes;
+        # a missing/invalid file is retried on the next call
+        try:
+            mtime = os.path.getmtime("wix_token.json")
+        except OSError:
+            return None
+        if self._wix_token is None or mtime != self._wix_token_mtime:
+            try:
+                self._wix_token = load_json_file("wix_token.json")
+            except Exception:
+                self._wix_token = None
+                return None
+            self._wix_token_mtime = mtime
+            if self._wix_manager is not None:
+                self._wix_manager.close() # Flush queued updates and release the old session
+            self._wix_manager = None # Rebuild the client with the new key
+        return self._wix_token
+
+    def _get_wix_manager(self):
+        # One WixInventoryManager (and so one pooled HTTP session) per token; None without a token
+        token_data = self._get_wix_token()
+        if token_data is None:
+            return None
+        if self._wix_manager is None:
+            self._wix_manager = WixInventoryManager(token_data.get("api_key"), WIX_SITE_ID, WIX_ACCOUNT_ID)
+        return self._wix_manager
 
     def load_wix_config(self):
         self.selected_wix_category_ids = []
         self.wix_dirty = False
         if os.path.exists("WixConfig.json"):
             try:
-                with open("WixConfig.json", "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.selected_wix_category_ids = data.get("selected_category_ids", [])
+                data = load_json_file("WixConfig.json")
+                self.selected_wix_category_ids = data.get("selected_category_ids", [])
             except Exception as e:
                 print(f"Error loading WixConfig.json: {e}")
 
@@ -2094,8 +2426,7 @@ del "%~f0" & exit
             "selected_category_ids": self.selected_wix_category_ids
         }
         try:
-            with open("WixConfig.json", "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            dump_json_file("WixConfig.json", data)
             self.mark_dirty()
         except Exception as e:
             messagebox.showerror("שגיאה", f"שגיאה בשמירת הגדרות Wix: {e}")
@@ -2143,22 +2474,16 @@ del "%~f0" & exit
         self.root.after(500, lambda: self.fetch_wix_categories(silent=True))
 
     def fetch_wix_categories(self, silent=False):
-        # Load token
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        # Shared Wix client (reads the token on first use)
+        manager = self._get_wix_manager()
+        if manager is None:
             if not silent:
                 messagebox.showerror("שגיאה", "לא נמצא קובץ wix_token.json או שהוא לא תקין.")
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
         try:
-            manager = WixInventoryManager(api_key, site_id, account_id)
-            collections = manager.get_collections()
+            # A manual refresh must hit Wix, not the short-lived collections cache
+            collections = manager.get_collections(refresh=not silent)
             
             if not collections:
                 if not silent:
@@ -2199,34 +2524,22 @@ del "%~f0" & exit
         if os.path.exists(excel_file):
             return
 
-        # Load token
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        # Shared Wix client (reads the token on first use)
+        manager = self._get_wix_manager()
+        if manager is None:
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
         try:
-            manager = WixInventoryManager(api_key, site_id, account_id)
-            all_products = manager.get_all_products(include_variants=False)
+            all_products = manager.get_all_products(include_variants=False, fields=("id", "name", "visible"))
             
             if not all_products:
                 return
 
-            backup_data = []
-            for p in all_products:
-                backup_data.append({
-                    "Product ID": p['id'],
-                    "Name": p.get('name', ''),
-                    "Visible": p.get('visible', True)
-                })
-            
-            df = pd.DataFrame(backup_data)
-            df.to_excel(excel_file, sheet_name='visibility', index=False)
+            # Stream product rows into the sheet without an intermediate DataFrame
+            with excel_writer(excel_file, rows_in_order=True) as writer:
+                append_row = sheet_row_writer(writer, 'visibility', ["Product ID", "Name", "Visible"])
+                for p in all_products:
+                    append_row([p['id'], p.get('name', ''), p.get('visible', True)])
             print(f"Created initial {excel_file}")
             self.mark_dirty()
             
@@ -2276,6 +2589,7 @@ del "%~f0" & exit
         for cid in current_tab_ids - active_ids:
             tab = self.category_tabs[cid]
             self.right_notebook.forget(tab)
+            self.tab_to_cid.pop(str(tab), None)
             tab.destroy()
             del self.category_tabs[cid]
             
@@ -2307,28 +2621,52 @@ del "%~f0" & exit
         pb.pack(pady=10)
         pb["maximum"] = len(new_cids)
         pb["value"] = 0
-        
-        self.root.update()
 
-        # Create tabs for new selections
-        for i, cid in enumerate(new_cids):
-            cat_name = cat_map[cid]
-            lbl.config(text=f"טוען קטגוריה: {cat_name} ({i+1}/{len(new_cids)})")
-            progress_win.update()
-            
-            self.create_category_tab(cid, cat_name, silent=True)
-            
-            pb["value"] = i + 1
-            progress_win.update()
-            
-        progress_win.destroy()
+        # Create tabs for new selections (empty until their products arrive)
+        for cid in new_cids:
+            self.create_category_tab(cid, cat_map[cid], silent=True, load=False)
+        
+        manager = self._get_wix_manager()
+        if manager is None:
+            progress_win.destroy()
+            return
+        
+        # Fetch every new category's products on the API pool; the trees are
+        # filled on the Tk thread as each fetch completes
+        linked_wix_ids = self._get_linked_wix_ids()
+        futures = {self.api_pool.submit(self._fetch_category_products, manager, cid): cid for cid in new_cids}
+        pending = set(futures)
+        
+        def tick():
+            for future in [f for f in pending if f.done()]:
+                pending.discard(future)
+                cid = futures[future]
+                try:
+                    all_products = future.result()
+                except Exception as e:
+                    print(f"Error loading products for tab {cid}: {e}")
+                else:
+                    # The tab may have been removed while its products were loading
+                    frame = self.category_tabs.get(cid)
+                    if frame is not None:
+                        self._populate_category_tree(frame, all_products, linked_wix_ids, silent=True)
+                done = len(futures) - len(pending)
+                lbl.config(text=f"טוען קטגוריה: {cat_map[cid]} ({done}/{len(new_cids)})")
+                pb["value"] = done
+            if pending:
+                self.root.after(50, tick)
+            else:
+                progress_win.destroy()
+        
+        self.root.after(50, tick)
 
-    def create_category_tab(self, category_id, category_name, silent=False):
+    def create_category_tab(self, category_id, category_name, silent=False, load=True):
         frame = ttk.Frame(self.right_notebook)
         # Use a generic image or specific one if available
         img = self.create_tab_image('lightblue') 
         self.right_notebook.add(frame, text=category_name, image=img, compound='left')
         self.category_tabs[category_id] = frame
+        self.tab_to_cid[str(frame)] = category_id
         
         # Controls
         btn_frame = ttk.Frame(frame)
@@ -2364,12 +2702,15 @@ del "%~f0" & exit
         scrollbar.pack(side='right', fill='y')
         
         frame.tree = tree
+        frame.tree_scrollbar = scrollbar
         frame.tree_map = {} # Map item_id -> {type, id, variant_id, ...}
         
         tree.bind("<Double-1>", lambda event: self.on_tree_double_click(event, frame))
+        tree.bind("<<TreeviewOpen>>", lambda event: self._on_tree_open(event, frame))
         
-        # Auto-load products
-        self.load_products_for_tab(category_id, silent=silent)
+        # Auto-load products (update_category_tabs loads new tabs itself, concurrently)
+        if load:
+            self.load_products_for_tab(category_id, silent=silent)
 
     def get_wix_mapping(self, wix_id):
         # Read from Bouquets.xlsx via bouquet module
@@ -2539,7 +2880,7 @@ del "%~f0" & exit
                              pass
                     break
                     
-            print(f"DEBUG: Linking with category: {category_name}")
+            log.debug("Linking with category: %s", category_name)
             self.link_wix_to_local_bouquet(item_data, tree, item_id, category_name)
         
         elif column == "#1": # Price
@@ -2548,8 +2889,7 @@ del "%~f0" & exit
             # Clean price string (remove currency symbol if present)
             try:
                 # Remove non-numeric chars except dot
-                import re
-                clean_price = re.sub(r'[^\d.]', '', str(current_price_str))
+                clean_price = PRICE_CLEAN_RE.sub('', str(current_price_str))
                 current_price = float(clean_price)
             except ValueError:
                 current_price = 0.0
@@ -2580,30 +2920,65 @@ del "%~f0" & exit
             if messagebox.askyesno("שינוי נראות", f"האם לשנות את נראות {item_type} ל-{'מוצג' if new_visible else 'מוסתר'}?"):
                 self.update_wix_visibility(item_data, new_visible, tree, item_id, current_values)
 
+    def run_wix_job(self, work, on_success, on_error, label=None, progressbar=None):
+        """
+        Run work(report) on the API pool without blocking the Tk event loop.
+        report(text=..., maximum=..., value=...) queues progress updates that are
+        applied to label/progressbar from the Tk thread; on_success(result) and
+        on_error(exception) are also called on the Tk thread.
+        """
+        events = queue.Queue()
+        future = self.api_pool.submit(work, lambda **kw: events.put(kw))
+
+        def tick():
+            # Coalesce everything reported since the last tick so per-item
+            # progress from the workers costs one widget update per tick
+            update = {}
+            while True:
+                try:
+                    pending = events.get_nowait()
+                except queue.Empty:
+                    break
+                if 'maximum' in pending:
+                    update.pop('value', None)
+                update.update(pending)
+            if label is not None and 'text' in update:
+                label.config(text=update['text'])
+            if progressbar is not None:
+                if 'maximum' in update:
+                    progressbar.stop()
+                    progressbar.config(mode="determinate", maximum=update['maximum'], value=0)
+                if 'value' in update:
+                    progressbar["value"] = update['value']
+            if not future.done():
+                self.root.after(50, tick)
+                return
+            try:
+                result = future.result()
+            except Exception as e:
+                on_error(e)
+                return
+            on_success(result)
+
+        self.root.after(50, tick)
+
     def update_wix_visibility(self, item_data, new_visible, tree, item_id, current_values):
-        # Load token
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        # Shared Wix client (reads the token on first use)
+        manager = self._get_wix_manager()
+        if manager is None:
             messagebox.showerror("שגיאה", "לא נמצא קובץ wix_token.json")
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
-        try:
-            manager = WixInventoryManager(api_key, site_id, account_id)
-            
+        def work(report):
             if item_data['type'] == 'product':
                 manager.update_product_visibility(item_data['id'], new_visible)
             elif item_data['type'] == 'variant':
                 manager.update_variant_visibility(item_data['product_id'], item_data['variant_id'], new_visible)
             
+        def on_success(result):
             # Update UI
             new_values = list(current_values)
-            new_values[2] = "כן" if new_visible else "לא"
+            new_values[2] = VISIBLE_YES if new_visible else VISIBLE_NO
             tree.item(item_id, values=new_values)
             
             # Update internal map
@@ -2612,104 +2987,95 @@ del "%~f0" & exit
             self.mark_dirty()
             # messagebox.showinfo("הצלחה", "הנראות עודכנה בהצלחה.")
             
-        except Exception as e:
+        def on_error(e):
             messagebox.showerror("שגיאה", f"שגיאה בעדכון נראות: {e}")
 
+        self.run_wix_job(work, on_success, on_error)
+
     def update_wix_inventory(self, item_data, new_stock, tree, item_id, current_values):
-        print(f"DEBUG: update_wix_inventory called. Type={item_data['type']}, ID={item_data.get('id') or item_data.get('variant_id')}, Stock={new_stock}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("update_wix_inventory called. Type=%s, ID=%s, Stock=%s",
+                      item_data['type'], item_data.get('id') or item_data.get('variant_id'), new_stock)
         
-        # Load token
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        # Shared Wix client (reads the token on first use)
+        manager = self._get_wix_manager()
+        if manager is None:
             messagebox.showerror("שגיאה", "לא נמצא קובץ wix_token.json")
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
-        try:
-            manager = WixInventoryManager(api_key, site_id, account_id)
-            
-            # Prepare variant update data
-            # If it's a product, we need its inventory item ID or default variant ID.
-            # But update_inventory_variants takes product_id and a list of variants.
-            # If it's a simple product (no variants), the variantId is usually the same as productId or 0000-0000...
-            # However, the API usually expects the variant ID.
-            
-            # For variants, we have variant_id.
-            # For products, we might need to check if it has variants.
-            
-            variant_id = item_data.get('variant_id')
-            if not variant_id:
-                # If it's a product row, it might be a simple product.
-                # In Wix, simple products have a single variant with ID '00000000-0000-0000-0000-000000000000' usually,
-                # OR we need to fetch the inventory item ID.
-                # Let's try using the product ID as variant ID or fetch variants first.
-                # Actually, update_inventory_variants in wix.py uses v2/inventoryItems/product/{product_id}
-                # and expects a list of variants.
-                
-                # If we are updating a "Product" row in the tree:
-                # 1. It might be a parent of variants (in which case, what does updating stock mean? All variants? Or is it just a display row?)
-                # 2. It might be a standalone product.
-                
-                # If it has children in the tree, it's a parent.
-                if tree.get_children(item_id):
-                    messagebox.showinfo("מידע", "לא ניתן לעדכן מלאי למוצר אב. אנא עדכן את הווריאנטים הספציפיים.")
-                    return
-                
+        # Prepare variant update data
+        # If it's a product, we need its inventory item ID or default variant ID.
+        # But update_inventory_variants takes product_id and a list of variants.
+        # If it's a simple product (no variants), the variantId is usually the same as productId or 0000-0000...
+        # However, the API usually expects the variant ID.
+        
+        # For variants, we have variant_id.
+        # For products, we might need to check if it has variants.
+        
+        variant_id = item_data.get('variant_id')
+        if not variant_id:
+            # If it's a product row, it might be a simple product.
+            # In Wix, simple products have a single variant with ID '00000000-0000-0000-0000-000000000000' usually,
+            # OR we need to fetch the inventory item ID.
+            # Let's try using the product ID as variant ID or fetch variants first.
+            # Actually, update_inventory_variants in wix.py uses v2/inventoryItems/product/{product_id}
+            # and expects a list of variants.
+            
+            # If we are updating a "Product" row in the tree:
+            # 1. It might be a parent of variants (in which case, what does updating stock mean? All variants? Or is it just a display row?)
+            # 2. It might be a standalone product.
+            
+            # If it has variant rows in the tree, it's a parent.
+            if item_data.get('has_variants'):
+                messagebox.showinfo("מידע", "לא ניתן לעדכן מלאי למוצר אב. אנא עדכן את הווריאנטים הספציפיים.")
+                return
+        
+        def work(report):
+            v_id = variant_id
+            if not v_id:
                 # If no children, it's a standalone product.
                 # We need to find its variant ID. Usually it's the same as product ID or we need to query it.
                 # Let's assume for now we can't easily update it without more info, OR try to fetch variants.
                 variants = manager.get_inventory_variants(item_data['id'])
                 if variants and 'variants' in variants and len(variants['variants']) > 0:
                     # Use the first variant (should be only one for standalone)
-                    variant_id = variants['variants'][0]['id']
+                    v_id = variants['variants'][0]['id']
                 else:
                     # Fallback for simple products which typically use the zero-UUID as variant ID
-                    variant_id = "00000000-0000-0000-0000-000000000000"
+                    v_id = "00000000-0000-0000-0000-000000000000"
 
-            # Construct update payload
-            variants_update = [{
-                "variantId": variant_id,
-                "quantity": new_stock
-            }]
-            
             product_id = item_data.get('product_id') or item_data.get('id')
             
-            manager.update_inventory_variants(product_id, variants_update)
+            # Queued so edits made in quick succession go out as one request per product
+            manager.queue_inventory_update(product_id, v_id, new_stock).result()
             
+        def on_success(result):
             # Update UI
             new_values = list(current_values)
             new_values[1] = str(new_stock)
             tree.item(item_id, values=new_values)
+            item_data['stock'] = new_stock
             
             messagebox.showinfo("הצלחה", "המלאי עודכן בהצלחה ב-Wix.")
             
-        except Exception as e:
-            print(f"DEBUG: Error in update_wix_inventory: {e}")
+        def on_error(e):
+            log.debug("Error in update_wix_inventory: %s", e)
             messagebox.showerror("שגיאה", f"שגיאה בעדכון המלאי: {e}")
 
+        self.run_wix_job(work, on_success, on_error)
+
     def update_wix_price(self, item_data, new_price, tree, item_id, current_values):
-        print(f"DEBUG: update_wix_price called. Type={item_data['type']}, ID={item_data.get('id') or item_data.get('variant_id')}, Price={new_price}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("update_wix_price called. Type=%s, ID=%s, Price=%s",
+                      item_data['type'], item_data.get('id') or item_data.get('variant_id'), new_price)
         
-        # Load token
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        # Shared Wix client (reads the token on first use)
+        manager = self._get_wix_manager()
+        if manager is None:
             messagebox.showerror("שגיאה", "לא נמצא קובץ wix_token.json")
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
-        try:
-            manager = WixInventoryManager(api_key, site_id, account_id)
-            
+        def work(report):
             if item_data['type'] == 'product':
                 manager.update_product_price(item_data['id'], new_price)
             elif item_data['type'] == 'variant':
@@ -2726,9 +3092,10 @@ del "%~f0" & exit
                 # and if the API required difference, I'd calculate it.
                 # But the API seems to take absolute.
                 
-                print(f"DEBUG: Calling update_variant_price for Product {item_data['product_id']}, Variant {item_data['variant_id']}")
+                log.debug("Calling update_variant_price for Product %s, Variant %s", item_data['product_id'], item_data['variant_id'])
                 manager.update_variant_price(item_data['product_id'], item_data['variant_id'], new_price, item_data.get('choices'))
                 
+        def on_success(result):
             # Update UI
             new_values = list(current_values)
             new_values[0] = f"₪{new_price:.2f}"
@@ -2736,268 +3103,300 @@ del "%~f0" & exit
             
             messagebox.showinfo("הצלחה", "המחיר עודכן בהצלחה ב-Wix.")
             
-        except Exception as e:
-            print(f"DEBUG: Error in update_wix_price: {e}")
+        def on_error(e):
+            log.debug("Error in update_wix_price: %s", e)
             messagebox.showerror("שגיאה", f"שגיאה בעדכון המחיר: {e}")
 
+        self.run_wix_job(work, on_success, on_error)
+
     def load_products_for_tab(self, category_id, silent=False):
-        # Load token
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        # Shared Wix client (reads the token on first use)
+        manager = self._get_wix_manager()
+        if manager is None:
             if not silent:
                 messagebox.showerror("שגיאה", "לא נמצא קובץ wix_token.json")
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
         frame = self.category_tabs.get(category_id)
         if not frame: return
         
-        tree = frame.tree
-        frame.tree_map = {} # Reset map
+        # Cleared up front so tab switches during the fetch don't queue a second load
+        frame.needs_reload = False
         
-        # Clear existing
-        for item in tree.get_children():
-            tree.delete(item)
-            
+        # Fetch on the API pool; the tree is filled on the Tk thread once the products arrive
+        def work(report):
+            return self._fetch_category_products(manager, category_id), self._get_linked_wix_ids()
+        
+        def on_success(result):
+            # The tab may have been removed while its products were loading
+            if self.category_tabs.get(category_id) is not frame:
+                return
+            all_products, linked_wix_ids = result
+            self._populate_category_tree(frame, all_products, linked_wix_ids, silent)
+        
+        def on_error(e):
+            frame.needs_reload = True
+            if not silent:
+                messagebox.showerror("שגיאה", f"שגיאה בטעינת מוצרים: {e}")
+            else:
+                print(f"Error loading products for tab {category_id}: {e}")
+        
+        self.run_wix_job(work, on_success, on_error)
+
+    def _get_linked_wix_ids(self):
+        # Wix IDs linked to a local bouquet (keys of the Bouquets.xlsx mapping)
         try:
-            manager = WixInventoryManager(api_key, site_id, account_id)
-            
-            # Get Wix Mapping
-            try:
-                wix_map = get_wix_id_map() # Wix ID -> Bouquet Name
-                # To quickly check if product is linked, we check keys
-                # We want: linked_product_ids = set(wix_map.keys())
-                linked_wix_ids = set(wix_map.keys())
-            except:
-                linked_wix_ids = set()
-            
-            # Fetch ALL products using pagination
-            all_products = []
-            offset = 0
-            limit = 50 # Reduced to prevent large payloads/timeouts
+            return set(get_wix_id_map().keys())
+        except:
+            return set()
+
+    def _fetch_category_products(self, manager, category_id):
+        # Fetch ALL products using pagination. Network only (no Tk calls), so it can run on the API pool
+        all_products = []
+        offset = 0
+        limit = 50 # Reduced to prevent large payloads/timeouts
+        
+        while True:
+            # Use query_products_by_collection
+            result = manager.query_products_by_collection(category_id, limit=limit, offset=offset)
             
-            while True:
-                # Use query_products_by_collection
-                result = manager.query_products_by_collection(category_id, limit=limit, offset=offset)
-                
-                if result and 'products' in result:
-                    batch = result['products']
-                    if not batch:
-                        break
-                        
-                    all_products.extend(batch)
+            if result and 'products' in result:
+                batch = result['products']
+                if not batch:
+                    break
                     
-                    if len(batch) < limit:
-                        break
-                        
-                    offset += limit
-                else:
+                all_products.extend(batch)
+                
+                if len(batch) < limit:
                     break
-            
-            print(f"DEBUG: Fetched {len(all_products)} products total.")
-            
+                    
+                offset += limit
+            else:
+                break
+        
+        log.debug("Fetched %d products total.", len(all_products))
+        return all_products
+
+    def _populate_category_tree(self, frame, all_products, linked_wix_ids, silent=False):
+        # Tk only: replace the tab's rows with the fetched products
+        frame.needs_reload = False
+        tree = frame.tree
+        tree.delete(*tree.get_children())
+        
+        # Detach the tree while filling it so Tk lays it out once, not once per row
+        tree_map = {}
+        frame.linked_wix_ids = linked_wix_ids
+        tree.pack_forget()
+        tree.configure(yscrollcommand='')
+        insert = tree.insert
+        linked_tags = ('linked',)
+        try:
             if all_products:
                 for p in all_products:
                     try:
+                        pid = p['id']
                         name = p.get('name', 'Unknown')
-                        # Debug print to trace breakage
-                        # print(f"Processing: {name}") 
-                        
-                        sku = p.get('sku', '')
-                        
+                        pvis = p.get('visible', True)
+                    
                         # Fix price extraction
                         price_data = p.get('price', {})
                         price = price_data.get('formatted', {}).get('price')
                         if not price:
                             price = price_data.get('price', 0)
-                        
+                    
                         # Stock extraction
                         stock_info = p.get('stock', {})
                         stock_qty = stock_info.get('quantity', 0)
                         # If quantity is None, it might be untracked or just inStock bool
                         if stock_qty is None:
                             stock_qty = 0
-                        
-                        visible = "כן" if p.get('visible', True) else "לא"
-                        
-                        # Check if linked
-                        is_linked = str(p['id']) in linked_wix_ids
-                        tags = ('linked',) if is_linked else ()
-
-                        # Insert parent
-                        parent_id = tree.insert("", tk.END, text=name, values=(price, stock_qty, visible), tags=tags)
-                        frame.tree_map[parent_id] = {'type': 'product', 'id': p['id'], 'name': name, 'visible': p.get('visible', True)}
-                        
-                        # Handle variants
-                        variants = p.get('variants', [])
+                    
+                        # Insert parent (highlighted if linked)
+                        tags = linked_tags if str(pid) in linked_wix_ids else ()
+                        parent_id = insert("", tk.END, text=name,
+                                           values=(price, stock_qty, VISIBLE_YES if pvis else VISIBLE_NO), tags=tags)
+                        tree_map[parent_id] = {'type': 'product', 'id': pid, 'name': name, 'visible': pvis,
+                                               'stock': stock_info.get('quantity')}
+                    
+                        # Handle variants - rows are inserted when the product is expanded.
+                        # Variants without choices never get a row, so drop them here
+                        variants = [v for v in p.get('variants', []) if v.get('choices')]
                         if variants:
-                            for v in variants:
-                                try:
-                                    choices = v.get('choices', {})
-                                    if not choices:
-                                        continue
-                                        
-                                    variant_name = " / ".join(choices.values())
-                                    
-                                    v_details = v.get('variant', {})
-                                    v_sku = v_details.get('sku', '')
-                                    
-                                    # Fix variant price extraction
-                                    v_price_data = v_details.get('priceData', {})
-                                    v_price = v_price_data.get('formatted', {}).get('price')
-                                    if not v_price:
-                                        v_price = v_price_data.get('price')
-                                    
-                                    # print(f"DEBUG: Loaded variant {v.get('id')} price: {v_price}")
-                                    
-                                    if v_price is None: v_price = price
-                                    
-                                    v_stock = v.get('stock', {})
-                                    v_stock_qty = v_stock.get('quantity', 0)
-                                    if v_stock_qty is None:
-                                        v_stock_qty = 0
-                                    
-                                    v_visible = "כן" if v_details.get('visible', True) else "לא"
-                                    
-                                    # Check if variant is linked
-                                    v_id = v.get('id')
-                                    is_v_linked = str(v_id) in linked_wix_ids if v_id else False
-                                    v_tags = ('linked',) if is_v_linked else ()
-
-                                    child_id = tree.insert(parent_id, tk.END, text=variant_name, values=(v_price, v_stock_qty, v_visible), tags=v_tags)
-                                    frame.tree_map[child_id] = {
-                                        'type': 'variant', 
-                                        'product_id': p['id'], 
-                                        'variant_id': v.get('id'), 
-                                        'name': variant_name,
-                                        'choices': choices,
-                                        'visible': v_details.get('visible', True)
-                                    }
-                                except Exception as e:
-                                    print(f"Error processing variant for {name}: {e}")
-                                    continue
+                            insert(parent_id, tk.END, text="...")
+                            tree_map[parent_id]['has_variants'] = True
+                            tree_map[parent_id]['_pending_variants'] = (p, variants, price)
 
                     except Exception as e:
                         print(f"Error processing product {p.get('id', '?')}: {e}")
                         continue
-                
+            
                 # messagebox.showinfo("הצלחה", f"נטענו {len(products)} מוצרים.")
             else:
                 if not silent:
                     messagebox.showinfo("מידע", "לא נמצאו מוצרים או שגיאה בטעינה.")
-            
-            # Configure tag colors
-            tree.tag_configure('linked', background='#ccffcc') # Light green
+        
+        finally:
+            tree.configure(yscrollcommand=frame.tree_scrollbar.set)
+            tree.pack(side='left', fill='both', expand=True, before=frame.tree_scrollbar)
+            frame.tree_map = tree_map
+        
+        # Configure tag colors
+        tree.tag_configure('linked', background='#ccffcc') # Light green
+
+    def _on_tree_open(self, event, frame):
+        self._populate_variants(frame, frame.tree.focus())
+
+    def _populate_variants(self, frame, parent_id):
+        # Replace a product's placeholder child with its variant rows (first expand only)
+        item_data = frame.tree_map.get(parent_id)
+        if not item_data or '_pending_variants' not in item_data:
+            return
+        p, variants, price = item_data.pop('_pending_variants')
+        tree = frame.tree
+        tree.delete(*tree.get_children(parent_id))
+        name = item_data['name']
+        linked_wix_ids = getattr(frame, 'linked_wix_ids', set())
+        tree_map = frame.tree_map
+        product_id = p['id']
+        
+        for v in variants:
+            try:
+                # Only variants with choices are queued by _populate_category_tree
+                choices = v['choices']
+                variant_name = VARIANT_NAME_SEP.join(choices.values())
                 
-        except Exception as e:
-            if not silent:
-                messagebox.showerror("שגיאה", f"שגיאה בטעינת מוצרים: {e}")
-            else:
-                print(f"Error loading products for tab {category_id}: {e}")
+                v_details = v.get('variant', {})
+                v_vis = v_details.get('visible', True)
+                
+                # Fix variant price extraction
+                v_price_data = v_details.get('priceData', {})
+                v_price = v_price_data.get('formatted', {}).get('price')
+                if not v_price:
+                    v_price = v_price_data.get('price')
+                
+                # log.debug("Loaded variant %s price: %s", v.get('id'), v_price)
+                
+                if v_price is None: v_price = price
+                
+                v_stock = v.get('stock', {})
+                v_stock_qty = v_stock.get('quantity', 0)
+                if v_stock_qty is None:
+                    v_stock_qty = 0
+                
+                # Check if variant is linked
+                v_id = v.get('id')
+                v_tags = ('linked',) if v_id and str(v_id) in linked_wix_ids else ()
+
+                child_id = tree.insert(parent_id, tk.END, text=variant_name,
+                                       values=(v_price, v_stock_qty, VISIBLE_YES if v_vis else VISIBLE_NO), tags=v_tags)
+                tree_map[child_id] = {
+                    'type': 'variant', 
+                    'product_id': product_id, 
+                    'variant_id': v_id, 
+                    'name': variant_name,
+                    'choices': choices,
+                    'visible': v_vis,
+                    'stock': v_stock.get('quantity')
+                }
+            except Exception as e:
+                print(f"Error processing variant for {name}: {e}")
+                continue
+
+    def _set_products_visibility(self, manager, product_ids, visible, report):
+        """
+        Update visibility for many products with up to 16 requests in flight.
+        Returns a list of (product_id, error) for the calls that failed.
+        """
+        failures = []
+        with ThreadPoolExecutor(max_workers=16) as ex:
+            futures = {ex.submit(manager.update_product_visibility, pid, visible): pid for pid in product_ids}
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append((futures[future], e))
+                report(value=done)
+        return failures
+
+    def _show_visibility_failures(self, failures):
+        details = "\n".join(f"{pid}: {e}" for pid, e in failures[:10])
+        if len(failures) > 10:
+            details += f"\n... ועוד {len(failures) - 10}"
+        messagebox.showwarning("אזהרה", f"עדכון הנראות נכשל עבור {len(failures)} מוצרים:\n{details}")
 
     def lock_wix_orders(self):
         if not messagebox.askyesno("נעילת הזמנות", "פעולה זו תסתיר את כל המוצרים באתר (תמנע הזמנות חדשות).\nהאם להמשיך?"):
             return
 
-        # Load token
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        # Shared Wix client (reads the token on first use)
+        manager = self._get_wix_manager()
+        if manager is None:
             messagebox.showerror("שגיאה", "לא נמצא קובץ wix_token.json")
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
-        try:
-            manager = WixInventoryManager(api_key, site_id, account_id)
-            
-            # 1. Fetch all products
-            progress_win = tk.Toplevel(self.root)
-            progress_win.title("נעילת הזמנות")
-            progress_win.geometry("300x150")
-            lbl = tk.Label(progress_win, text="טוען רשימת מוצרים...")
-            lbl.pack(pady=10)
-            pb = ttk.Progressbar(progress_win, orient="horizontal", length=280, mode="indeterminate")
-            pb.pack(pady=10)
-            pb.start(10)
-            self.root.update()
-            
-            all_products = manager.get_all_products(include_variants=False)
+        # 1. Fetch all products
+        progress_win = tk.Toplevel(self.root)
+        progress_win.title("נעילת הזמנות")
+        progress_win.geometry("300x150")
+        lbl = tk.Label(progress_win, text="טוען רשימת מוצרים...")
+        lbl.pack(pady=10)
+        pb = ttk.Progressbar(progress_win, orient="horizontal", length=280, mode="indeterminate")
+        pb.pack(pady=10)
+        pb.start(10)
+        
+        state = {'backup_saved': False}
+        
+        def work(report):
+            all_products = manager.get_all_products(include_variants=False, fields=("id", "name", "visible"))
             
             if not all_products:
-                progress_win.destroy()
-                messagebox.showinfo("מידע", "לא נמצאו מוצרים או שגיאה בטעינה.")
-                return
+                return None
 
             # 2. Backup visibility state to Excel
-            backup_data = []
-            for p in all_products:
-                backup_data.append({
-                    "Product ID": p['id'],
-                    "Name": p.get('name', ''),
-                    "Visible": p.get('visible', True)
-                })
-            
-            df = pd.DataFrame(backup_data)
             excel_file = "wix.xlsx"
             
             try:
-                # Try to append if file exists, otherwise create new
-                if os.path.exists(excel_file):
-                    with pd.ExcelWriter(excel_file, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-                        df.to_excel(writer, sheet_name='visibility', index=False)
-                else:
-                    df.to_excel(excel_file, sheet_name='visibility', index=False)
-                    
-                lbl.config(text=f"גיבוי נשמר בקובץ {excel_file}")
+                # Replaces the visibility sheet if the file exists, otherwise creates it
+                write_visibility_backup(excel_file, all_products)
+                report(text=f"גיבוי נשמר בקובץ {excel_file}")
             except Exception as e:
-                # Fallback for older pandas versions or other errors: overwrite file or try simple write
+                # Fallback for a corrupt/locked workbook: overwrite the file with just the backup
                 print(f"Backup error (trying overwrite): {e}")
-                df.to_excel(excel_file, sheet_name='visibility', index=False)
-                lbl.config(text=f"גיבוי נשמר בקובץ {excel_file}")
+                if os.path.exists(excel_file):
+                    os.remove(excel_file)
+                write_visibility_backup(excel_file, all_products)
+                report(text=f"גיבוי נשמר בקובץ {excel_file}")
             
-            self.mark_dirty()
-            self.root.update()
+            state['backup_saved'] = True
 
             # 3. Hide products
-            lbl.config(text="מסתיר מוצרים...")
-            pb.stop()
-            pb.config(mode="determinate", maximum=len(all_products), value=0)
-            self.root.update()
-            
-            for i, product in enumerate(all_products):
-                product_id = product['id']
-                # Only hide if currently visible (optimization)
-                if product.get('visible', True):
-                    manager.update_product_visibility(product_id, False)
-                
-                pb["value"] = i + 1
-                progress_win.update()
+            # Only hide if currently visible (optimization)
+            to_hide = [product['id'] for product in all_products if product.get('visible', True)]
+            report(text="מסתיר מוצרים...", maximum=len(to_hide))
+            return self._set_products_visibility(manager, to_hide, False, report)
                 
+        def on_success(failures):
             progress_win.destroy()
-            messagebox.showinfo("הצלחה", "ההזמנות ננעלו בהצלחה (כל המוצרים הוסתרו).")
+            if failures is None:
+                messagebox.showinfo("מידע", "לא נמצאו מוצרים או שגיאה בטעינה.")
+                return
+            self.mark_dirty()
+            if failures:
+                self._show_visibility_failures(failures)
+            else:
+                messagebox.showinfo("הצלחה", "ההזמנות ננעלו בהצלחה (כל המוצרים הוסתרו).")
             
-            # Refresh current tab if any
-            current_tab = self.right_notebook.select()
-            if current_tab:
-                # Find category id for this tab
-                for cid, frame in self.category_tabs.items():
-                    if str(frame) == current_tab:
-                        self.load_products_for_tab(cid, silent=True)
-                        break
+            # Category tabs reload when next shown
+            self.mark_category_tabs_stale()
 
-        except Exception as e:
-            if 'progress_win' in locals(): progress_win.destroy()
+        def on_error(e):
+            progress_win.destroy()
+            if state['backup_saved']:
+                self.mark_dirty()
             messagebox.showerror("שגיאה", f"שגיאה בנעילת הזמנות: {e}")
 
+        self.run_wix_job(work, on_success, on_error, label=lbl, progressbar=pb)
+
     def unlock_wix_orders(self):
         excel_file = "wix.xlsx"
         if not os.path.exists(excel_file):
@@ -3005,8 +3404,8 @@ del "%~f0" & exit
             return
             
         try:
-            df = pd.read_excel(excel_file, sheet_name='visibility')
-            if df.empty:
+            visibility_state = read_visibility_backup(excel_file)
+            if not visibility_state:
                 messagebox.showinfo("מידע", "גיליון visibility ריק.")
                 return
         except Exception as e:
@@ -3016,68 +3415,48 @@ del "%~f0" & exit
         if not messagebox.askyesno("פתיחת הזמנות", "האם לשחזר את נראות המוצרים מקובץ wix.xlsx?"):
             return
             
-        # Convert DataFrame to dict for easier lookup
-        visibility_state = {}
-        for _, row in df.iterrows():
-            visibility_state[row['Product ID']] = row['Visible']
-
-        # Load token
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        # Shared Wix client (reads the token on first use)
+        manager = self._get_wix_manager()
+        if manager is None:
             messagebox.showerror("שגיאה", "לא נמצא קובץ wix_token.json")
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
-        try:
-            manager = WixInventoryManager(api_key, site_id, account_id)
-            
-            progress_win = tk.Toplevel(self.root)
-            progress_win.title("פתיחת הזמנות")
-            progress_win.geometry("300x150")
-            lbl = tk.Label(progress_win, text="משחזר נראות מוצרים...")
-            lbl.pack(pady=10)
-            pb = ttk.Progressbar(progress_win, orient="horizontal", length=280, mode="determinate")
-            pb.pack(pady=10)
-            pb["maximum"] = len(visibility_state)
-            pb["value"] = 0
-            self.root.update()
-            
-            i = 0
-            for product_id, was_visible in visibility_state.items():
-                # Only update if it was visible (since we hid everything)
-                # Or should we restore False too? 
-                # If we restore False, we ensure products that were hidden stay hidden.
-                # But we only need to call API if we want to change it to True.
-                # Wait, everything is currently False (hidden).
-                # So we only need to update those that should be True.
-                
-                if was_visible:
-                    manager.update_product_visibility(product_id, True)
-                
-                i += 1
-                pb["value"] = i
-                progress_win.update()
+        progress_win = tk.Toplevel(self.root)
+        progress_win.title("פתיחת הזמנות")
+        progress_win.geometry("300x150")
+        lbl = tk.Label(progress_win, text="משחזר נראות מוצרים...")
+        lbl.pack(pady=10)
+        pb = ttk.Progressbar(progress_win, orient="horizontal", length=280, mode="determinate")
+        pb.pack(pady=10)
+        # Only update if it was visible (since we hid everything)
+        # Or should we restore False too? 
+        # If we restore False, we ensure products that were hidden stay hidden.
+        # But we only need to call API if we want to change it to True.
+        # Wait, everything is currently False (hidden).
+        # So we only need to update those that should be True.
+        to_show = [product_id for product_id, was_visible in visibility_state.items() if was_visible]
+        pb["maximum"] = len(to_show)
+        pb["value"] = 0
+        
+        def work(report):
+            return self._set_products_visibility(manager, to_show, True, report)
                 
+        def on_success(failures):
             progress_win.destroy()
-            messagebox.showinfo("הצלחה", "ההזמנות נפתחו בהצלחה (נראות המוצרים שוחזרה).")
+            if failures:
+                self._show_visibility_failures(failures)
+            else:
+                messagebox.showinfo("הצלחה", "ההזמנות נפתחו בהצלחה (נראות המוצרים שוחזרה).")
             
-            # Refresh current tab if any
-            current_tab = self.right_notebook.select()
-            if current_tab:
-                for cid, frame in self.category_tabs.items():
-                    if str(frame) == current_tab:
-                        self.load_products_for_tab(cid, silent=True)
-                        break
+            # Category tabs reload when next shown
+            self.mark_category_tabs_stale()
 
-        except Exception as e:
-            if 'progress_win' in locals(): progress_win.destroy()
+        def on_error(e):
+            progress_win.destroy()
             messagebox.showerror("שגיאה", f"שגיאה בפתיחת הזמנות: {e}")
 
+        self.run_wix_job(work, on_success, on_error, label=lbl, progressbar=pb)
+
     def empty_category_inventory(self, category_id):
         if not messagebox.askyesno("אישור", "האם אתה בטוח שברצונך לאפס את המלאי לכל המוצרים בקטגוריה זו?"):
             return
@@ -3090,110 +3469,121 @@ del "%~f0" & exit
         # Collect all items to update
         items_to_update = []
         
+        # Variant rows are only inserted on expand; materialize them all first
+        for item_id in tree.get_children():
+            self._populate_variants(frame, item_id)
+        
         for item_id in tree.get_children():
             item_data = frame.tree_map.get(item_id)
             if not item_data: continue
             
             # If it's a product with variants (has children), we skip the parent row itself 
             # and process children.
+            # Items already tracked at 0 are skipped ('stock' is None when untracked)
             children = tree.get_children(item_id)
             if children:
                 for child_id in children:
                     child_data = frame.tree_map.get(child_id)
-                    if child_data and child_data['type'] == 'variant':
+                    if child_data and child_data['type'] == 'variant' and child_data.get('stock') != 0:
                         items_to_update.append((child_data, child_id))
             else:
                 # Standalone product or product without variants loaded?
-                if item_data['type'] == 'product':
+                if item_data['type'] == 'product' and item_data.get('stock') != 0:
                      items_to_update.append((item_data, item_id))
 
         if not items_to_update:
             messagebox.showinfo("מידע", "לא נמצאו פריטים לעדכון.")
             return
 
-        # Load token
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        # Shared Wix client (reads the token on first use)
+        manager = self._get_wix_manager()
+        if manager is None:
             messagebox.showerror("שגיאה", "לא נמצא קובץ wix_token.json")
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
-        try:
-            manager = WixInventoryManager(api_key, site_id, account_id)
-            
-            # Group by product_id
-            updates_by_product = defaultdict(list)
+        # One progress window for both phases: preparing variants, then updating Wix
+        progress_win = tk.Toplevel(self.root)
+        progress_win.title("מאפס מלאי...")
+        progress_win.geometry("300x100")
+        lbl = tk.Label(progress_win, text="מכין נתונים...")
+        lbl.pack(pady=10)
+        pb = ttk.Progressbar(progress_win, orient="horizontal", length=280, mode="indeterminate")
+        pb.pack(pady=10)
+        pb.start(10)
+        
+        def work(report):
+            # Group variant IDs by product_id; payloads are built when each update is sent
+            variant_ids_by_product = defaultdict(list)
             
-            # Progress for preparation
-            progress_win = tk.Toplevel(self.root)
-            progress_win.title("מכין נתונים...")
-            progress_win.geometry("300x100")
-            lbl = tk.Label(progress_win, text="מכין נתונים...")
-            lbl.pack(pady=10)
+            def fetch_variant_id(p_id):
+                # Fetch variants for standalone product
+                try:
+                    variants = manager.get_inventory_variants(p_id)
+                    if variants and 'variants' in variants:
+                        return variants['variants'][0]['id']
+                    log.debug("Skipping %s - no variant found", p_id)
+                except Exception as e:
+                    print(f"Error fetching variants for {p_id}: {e}")
+                return None
             
-            self.root.update()
+            # Look up the missing variant IDs concurrently
+            lookup_ids = list(dict.fromkeys((data.get('product_id') or data.get('id'))
+                                            for data, tree_id in items_to_update if not data.get('variant_id')))
+            with ThreadPoolExecutor(max_workers=16) as ex:
+                looked_up = dict(zip(lookup_ids, ex.map(fetch_variant_id, lookup_ids)))
             
             for data, tree_id in items_to_update:
                 p_id = data.get('product_id') or data.get('id')
-                v_id = data.get('variant_id')
-                
+                v_id = data.get('variant_id') or looked_up.get(p_id)
                 if not v_id:
-                    # Fetch variants for standalone product
+                    continue
+                
+                variant_ids_by_product[p_id].append(v_id)
+            
+            if not variant_ids_by_product:
+                return None
+
+            def zero_stock(p_id, v_ids):
+                result = manager.update_inventory_variants(p_id, [{"variantId": v_id, "quantity": 0} for v_id in v_ids])
+                if result is None:
+                    raise Exception("Wix update failed")
+                return result
+
+            # Perform updates, up to 16 products at a time
+            report(text="מעדכן Wix...", maximum=len(variant_ids_by_product))
+            
+            failures = []
+            with ThreadPoolExecutor(max_workers=16) as ex:
+                futures = {ex.submit(zero_stock, p_id, v_ids): p_id
+                           for p_id, v_ids in variant_ids_by_product.items()}
+                for done, future in enumerate(as_completed(futures), 1):
                     try:
-                        variants = manager.get_inventory_variants(p_id)
-                        if variants and 'variants' in variants:
-                            v_id = variants['variants'][0]['id']
-                        else:
-                            print(f"Skipping {p_id} - no variant found")
-                            continue
+                        future.result()
                     except Exception as e:
-                        print(f"Error fetching variants for {p_id}: {e}")
-                        continue
+                        failures.append((futures[future], e))
+                    report(value=done)
+            return failures
                 
-                updates_by_product[p_id].append({
-                    "variantId": v_id,
-                    "quantity": 0
-                })
-            
+        def on_success(failures):
             progress_win.destroy()
-            
-            if not updates_by_product:
+            if failures is None:
                 messagebox.showinfo("מידע", "לא נמצאו וריאנטים לעדכון.")
                 return
-
-            # Perform updates
-            progress_win = tk.Toplevel(self.root)
-            progress_win.title("מאפס מלאי...")
-            progress_win.geometry("300x100")
-            lbl = tk.Label(progress_win, text="מעדכן Wix...")
-            lbl.pack(pady=10)
-            pb = ttk.Progressbar(progress_win, orient="horizontal", length=280, mode="determinate")
-            pb.pack(pady=10)
-            pb["maximum"] = len(updates_by_product)
-            pb["value"] = 0
-            
-            self.root.update()
-            
-            for i, (p_id, variants_update) in enumerate(updates_by_product.items()):
-                manager.update_inventory_variants(p_id, variants_update)
-                pb["value"] = i + 1
-                progress_win.update()
-                
-            progress_win.destroy()
             
             # Refresh tab
             self.load_products_for_tab(category_id)
-            messagebox.showinfo("הצלחה", "המלאי אופס בהצלחה.")
+            if failures:
+                details = "\n".join(f"{p_id}: {e}" for p_id, e in failures[:10])
+                messagebox.showwarning("אזהרה", f"איפוס המלאי נכשל עבור {len(failures)} מוצרים:\n{details}")
+            else:
+                messagebox.showinfo("הצלחה", "המלאי אופס בהצלחה.")
             
-        except Exception as e:
-            if 'progress_win' in locals(): progress_win.destroy()
+        def on_error(e):
+            progress_win.destroy()
             messagebox.showerror("שגיאה", f"שגיאה באיפוס מלאי: {e}")
 
+        self.run_wix_job(work, on_success, on_error, label=lbl, progressbar=pb)
+
     def create_customers_tab(self):
         self.customers_tab = ttk.Frame(self.right_notebook)
         self.right_notebook.add(self.customers_tab, text="לקוחות", compound='left')
@@ -3246,18 +3636,11 @@ del "%~f0" & exit
             widget.destroy()
             
         # Get Wix manager
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        manager = self._get_wix_manager()
+        if manager is None:
             messagebox.showerror("שגיאה", "לא נמצא קובץ wix_token.json")
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
-        manager = WixInventoryManager(api_key, site_id, account_id)
         
         # Show loading
         loading_frame = ttk.Frame(self.customers_list_frame)
@@ -3282,39 +3665,9 @@ del "%~f0" & exit
                 if not customers_data:
                     print("Fallback: extracting customers from orders...")
                     
-                    # Fetch ALL orders (paginated) to ensure we capture every historical customer identity
-                    all_fetched_orders = []
-                    offset = 0
-                    batch_size = 100 # Wix Max
-                    
-                    while True:
-                        # Update loading text if possible, or print debug
-                        print(f"Fetching orders offset {offset}...")
-                        
-                        # Added ContactID exclusion filter to manual map auto-population logic
-                        # But we can't filter the fetch easily.
-                        
-                        batch_data = manager.get_orders(limit=batch_size, offset=offset)
-                        if not batch_data:
-                            break
-                            
-                        orders_batch = batch_data.get('orders', [])
-                        if not orders_batch:
-                            break
-                            
-                        all_fetched_orders.extend(orders_batch)
-                        
-                        if len(orders_batch) < batch_size:
-                            # End of list
-                            break
-                        
-                        offset += batch_size
-                        
-                        # Safety break to prevent infinite loops if something goes wrong, 
-                        # but 5000 is a reasonable soft limit for this context
-                        if offset > 5000: 
-                            print("Reached safety limit of 5000 orders.")
-                            break
+                    # Fetch ALL orders (paginated) to ensure we capture every historical customer identity.
+                    # 100 per page is the Wix max; 5000 orders is a reasonable soft limit for this context
+                    all_fetched_orders = manager.get_all_orders(limit=100, max_orders=5000)
                     
                     print(f"Total orders fetched: {len(all_fetched_orders)}")
                     
@@ -3943,18 +4296,11 @@ del "%~f0" & exit
             pass 
             
         # Get Wix manager
-        try:
-            with open("wix_token.json", "r") as f:
-                token_data = json.load(f)
-                api_key = token_data.get("api_key")
-        except Exception:
+        manager = self._get_wix_manager()
+        if manager is None:
             messagebox.showerror("שגיאה", "לא נמצא קובץ wix_token.json")
             return
-
-        site_id = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
-        account_id = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
         
-        manager = WixInventoryManager(api_key, site_id, account_id)
         
         # Show loading indicator
         self.summary_tree.insert("", "end", text="טוען נתונים...", values=("", "", ""), tags=('loading',))
@@ -3967,21 +4313,7 @@ del "%~f0" & exit
             area_summary = {}
             
             try:
-                all_orders = []
-                offset = 0
-                batch_size = 50
-                
-                while True:
-                    data = manager.get_orders(limit=batch_size, offset=offset, fulfillment_status="NOT_FULFILLED")
-                    if not data:
-                        break
-                    orders_batch = data.get('orders', [])
-                    if not orders_batch:
-                        break
-                    all_orders.extend(orders_batch)
-                    if len(orders_batch) < batch_size:
-                        break
-                    offset += len(orders_batch)
+                all_orders = manager.get_all_orders(fulfillment_status="NOT_FULFILLED")
 
                 # Enrich each order with delivery area from eCommerce v1 API
                 for order in all_orders:
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from wix import WixInventoryManager
+
+
+def make_manager(total):
+    """A manager whose get_orders serves `total` fake orders, recording each page request."""
+    manager = WixInventoryManager("key", "site")
+    manager.requested = []
+
+    def get_orders(customer_id=None, limit=50, offset=0, fulfillment_status=None):
+        manager.requested.append((offset, limit))
+        orders = [{"id": i} for i in range(offset, min(offset + limit, total))]
+        return {"orders": orders, "totalResults": total}
+
+    manager.get_orders = get_orders
+    return manager
+
+
+def test_max_orders_spanning_pages():
+    manager = make_manager(total=500)
+    orders = manager.get_all_orders(limit=100, max_orders=150)
+    assert [o["id"] for o in orders] == list(range(150))
+    assert sorted(manager.requested) == [(0, 100), (100, 50)]
+
+
+def test_max_orders_below_limit():
+    manager = make_manager(total=500)
+    orders = manager.get_all_orders(limit=100, max_orders=30)
+    assert [o["id"] for o in orders] == list(range(30))
+    assert manager.requested == [(0, 30)]
+
+
+def test_without_max_orders_fetches_everything():
+    manager = make_manager(total=250)
+    orders = manager.get_all_orders(limit=100)
+    assert [o["id"] for o in orders] == list(range(250))
@@ -1,15 +1,107 @@
 import requests
+import copy
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, Future
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
 import sys
-from pprint import pprint
+import time
+import threading
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _response_json(response):
+    """
+    Parse a response body, with orjson when it is installed. Bodies orjson
+    rejects go through response.json() so callers see requests' own error.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+    return response.json()
+
+def _print_error_response(e, label="Response"):
+    # Print the body of a failed request, when the exception carries one
+    response = getattr(e, 'response', None)
+    if response is not None:
+        print(f"{label}: {response.text}")
+
+def _filter_json(filter_dict):
+    # Wix query filters are passed as a JSON string
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(filter_dict).decode()
+    return json.dumps(filter_dict)
+
+@functools.lru_cache(maxsize=256)
+def _collection_filter(*collection_ids):
+    # Encoded "products in any of these collections" filter; the same few collections are queried page after page
+    return _filter_json({"collections.id": {"$hasSome": list(collection_ids)}})
+
+# On-disk cache for managers created with disk_cache=True (set WIX_NOCACHE to bypass it)
+DISK_CACHE_DIR = ".wix_cache"
+DISK_CACHE_TTL = 600
+
+def disk_ttl_cache(func):
+    """
+    Cache a read-only manager method's result as JSON under DISK_CACHE_DIR, keyed
+    by method name and arguments, and reuse it for DISK_CACHE_TTL seconds.
+    Only active on managers created with disk_cache=True; failed (None/empty) results are not stored.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not self.disk_cache or os.environ.get("WIX_NOCACHE"):
+            return func(self, *args, **kwargs)
+        key = repr((func.__name__, args, sorted(kwargs.items())))
+        path = os.path.join(DISK_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry["ts"] < DISK_CACHE_TTL:
+                return entry["data"]
+        except (OSError, ValueError, KeyError):
+            pass
+        data = func(self, *args, **kwargs)
+        if data:
+            try:
+                os.makedirs(DISK_CACHE_DIR, exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump({"ts": time.time(), "data": data}, f, ensure_ascii=False)
+            except OSError as e:
+                print(f"Could not write Wix cache {path}: {e}")
+        return data
+    return wrapper
+
+# Fixed query endpoints (per-product URLs are still built per call)
+PRODUCTS_QUERY_URL = "https://www.wixapis.com/stores/v1/products/query?includeHiddenProducts=true"
+COLLECTIONS_QUERY_URL = "https://www.wixapis.com/stores/v1/collections/query"
+INVENTORY_QUERY_URL = "https://www.wixapis.com/stores/v2/inventoryItems/query"
+CONTACTS_QUERY_URL = "https://www.wixapis.com/contacts/v4/contacts/query"
+ORDERS_QUERY_URL = "https://www.wixapis.com/stores/v2/orders/query"
+# get_collections' request body never changes (it is only read when serialized)
+COLLECTIONS_QUERY = {"query": {"paging": {"limit": 100}}}
+
+# Seconds a fetched product / the collections list is reused before re-querying Wix
+PRODUCT_TTL = 30
+COLLECTIONS_TTL = 60
+# Requests one manager keeps in flight at once, across all worker threads, to stay under Wix rate limits
+MAX_IN_FLIGHT = 10
+# Seconds queued stock changes wait for more edits before they are sent
+INVENTORY_FLUSH_DELAY = 0.3
 
 # ==========================================
 # Wix Stores API Inventory Manager
 # ==========================================
 
 class WixInventoryManager:
-    def __init__(self, api_key, site_id, account_id=None):
+    def __init__(self, api_key, site_id, account_id=None, disk_cache=False):
         """
         Initialize the Wix Inventory Manager
         
@@ -17,7 +109,10 @@ class WixInventoryManager:
             api_key: Your Wix API key (OAuth token)
             site_id: Your Wix site ID
             account_id: Your Wix account ID (optional)
+            disk_cache: Reuse product query results from DISK_CACHE_DIR
+                        across runs (for scripts; the app needs live data)
         """
+        self.disk_cache = disk_cache
         self.api_key = api_key
         self.site_id = site_id
         self.account_id = account_id
@@ -29,39 +124,82 @@ class WixInventoryManager:
         if self.account_id:
             self.headers["wix-account-id"] = self.account_id
 
-    def get_collections(self):
+        # Verbose request/response dumps, off unless WIX_DEBUG is set
+        self.debug = bool(os.environ.get("WIX_DEBUG"))
+
+        # Reuse connections (and TLS sessions) across calls; sized for concurrent bulk updates.
+        # Rate limits (429) and transient 5xx are retried with backoff, honouring Retry-After;
+        # once retries run out the last response is returned so callers still see its status.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retry = Retry(total=5, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["GET", "POST", "PATCH", "PUT"],
+                      respect_retry_after_header=True,
+                      raise_on_status=False)
+        # Every call goes to www.wixapis.com, so a single host pool is enough; its
+        # sockets are kept alive and shared by all worker threads
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=retry)
+        self.session.mount("https://", adapter)
+
+        # get_inventory_variants responses by product ID; dropped when that product's inventory is updated
+        self._variant_cache = {}
+        # product_id -> (fetched_at, get_product response); dropped when the product is updated
+        self._product_cache = {}
+        # (fetched_at, collections list) from get_collections
+        self._collections_cache = None
+        # Queued stock changes: product_id -> {variant_id: (quantity, [futures])}, see queue_inventory_update
+        self._pending_inventory = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock() # one flush at a time
+        self._flush_timer = None
+        self._in_flight = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+
+    def _request(self, method, url, **kwargs):
+        """
+        Send a request on the pooled session and return the parsed JSON body.
+        HTTP errors raise requests.exceptions.HTTPError.
+        
+        The MAX_IN_FLIGHT slot is held for the whole call, including the session's
+        429/5xx retry backoff. That is deliberate: while Wix is rate limiting,
+        other callers would only collect 429s of their own, so waiting for the
+        slot backs the whole manager off instead of adding load.
+        """
+        if ORJSON_AVAILABLE and 'json' in kwargs:
+            # Send pre-encoded bytes; the session already sets Content-Type: application/json
+            kwargs['data'] = orjson.dumps(kwargs.pop('json'))
+        with self._in_flight:
+            response = self.session.request(method, url, **kwargs)
+        response.raise_for_status()
+        return _response_json(response)
+
+    def close(self):
         """
-        Retrieves all collections to map names to IDs.
+        Send any queued stock changes and close the pooled HTTP connections.
         """
-        url = "https://www.wixapis.com/stores/v1/collections/query"
-        payload = {"query": {"paging": {"limit": 100}}}
-        
-        print("Fetching collections...")
-        try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json().get('collections', [])
-        except Exception as e:
-            print(f"Error fetching collections: {e}")
-            return []
+        self.flush_inventory_updates()
+        self.session.close()
 
     def query_products_by_collection(self, collection_id: str, limit: int = 100, 
                                      offset: int = 0, include_variants: bool = True):
         """
         Query products from a specific collection using Management API (shows hidden/out-of-stock)
         """
-        url = "https://www.wixapis.com/stores/v1/products/query?includeHiddenProducts=true"
-        
-        # Filter by collection ID
-        filter_json = {
-            "collections.id": {
-                "$hasSome": [collection_id]
-            }
-        }
+        return self.query_products_by_collections([collection_id], limit=limit, offset=offset,
+                                                  include_variants=include_variants)
+
+    @disk_ttl_cache
+    def query_products_by_collections(self, collection_ids, limit=100, offset=0, include_variants=True):
+        """
+        Query products that belong to any of the given collections with a single
+        request. Each product appears once even if it is in several collections.
+        """
+        url = PRODUCTS_QUERY_URL
         
         payload = {
             "query": {
-                "filter": json.dumps(filter_json),  # Must be a JSON string
+                # Filter by collection IDs
+                "filter": _collection_filter(*collection_ids),  # Must be a JSON string
                 "paging": {
                     "limit": limit,
                     "offset": offset
@@ -71,22 +209,38 @@ class WixInventoryManager:
         }
         
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            
-            response.raise_for_status()
-            return response.json()
+            return self._request("POST", url, json=payload)
         except requests.exceptions.RequestException as e:
             print(f"❌ Error querying products: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
+            _print_error_response(e)
             return None
 
+    def iter_products_by_collections(self, collection_ids, limit=100, include_variants=True):
+        """
+        Yield every product in any of the given collections, page by page, so only
+        the current page is held in memory. Each product is yielded once.
+        """
+        seen = set()
+        offset = 0
+        while True:
+            result = self.query_products_by_collections(collection_ids, limit=limit, offset=offset,
+                                                        include_variants=include_variants)
+            products = result.get('products', []) if result else []
+            for p in products:
+                pid = p['id']
+                if pid not in seen:
+                    seen.add(pid)
+                    yield p
+            if len(products) < limit:
+                return
+            offset += len(products)
+
     def get_store_products(self, limit=50, offset=0, include_variants=True):
         """
         Retrieves a list of products from the store.
         Uses Wix Stores Management API v1 Query endpoint.
         """
-        url = "https://www.wixapis.com/stores/v1/products/query?includeHiddenProducts=true"
+        url = PRODUCTS_QUERY_URL
         
         payload = {
             "query": {
@@ -98,40 +252,41 @@ class WixInventoryManager:
             "includeVariants": include_variants
         }
         
-        print(f"🔍 DEBUG: Calling URL: {url}")
-        print(f"🔍 DEBUG: Payload: {json.dumps(payload, indent=2, ensure_ascii=False)}")
-        print(f"🔍 DEBUG: Headers: {json.dumps({k: v[:20] + '...' if k == 'Authorization' else v for k, v in self.headers.items()}, indent=2, ensure_ascii=False)}")
+        if self.debug:
+            print(f"🔍 DEBUG: Calling URL: {url}")
+            print(f"🔍 DEBUG: Payload: {json.dumps(payload, indent=2, ensure_ascii=False)}")
+            print(f"🔍 DEBUG: Headers: {json.dumps({k: v[:20] + '...' if k == 'Authorization' else v for k, v in self.headers.items()}, indent=2, ensure_ascii=False)}")
         
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            print(f"🔍 DEBUG: Response Status: {response.status_code}")
-            print(f"🔍 DEBUG: Response Body: {response.text[:500]}")
-            
-            response.raise_for_status()
-            result = response.json()
+            result = self._request("POST", url, json=payload)
             
-            print(f"🔍 DEBUG: Products count in response: {len(result.get('products', []))}")
-            print(f"🔍 DEBUG: Total results: {result.get('totalResults', 'N/A')}")
+            if self.debug:
+                print(f"🔍 DEBUG: Products count in response: {len(result.get('products', []))}")
+                print(f"🔍 DEBUG: Total results: {result.get('totalResults', 'N/A')}")
             
             return result
         except requests.exceptions.RequestException as e:
             print(f"❌ Error querying products: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
+            _print_error_response(e)
             return None
 
-    def get_collections(self):
+    def get_collections(self, refresh=False):
         """
         Retrieves all collections to map names to IDs.
+        A successful result is reused for COLLECTIONS_TTL seconds unless refresh is True.
         """
-        url = "https://www.wixapis.com/stores/v1/collections/query"
-        payload = {"query": {"paging": {"limit": 100}}}
+        cached = self._collections_cache
+        if not refresh and cached is not None and time.monotonic() - cached[0] < COLLECTIONS_TTL:
+            return cached[1]
+
+        url = COLLECTIONS_QUERY_URL
+        payload = COLLECTIONS_QUERY
         
         print("Fetching collections...")
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json().get('collections', [])
+            collections = self._request("POST", url, json=payload).get('collections', [])
+            self._collections_cache = (time.monotonic(), collections)
+            return collections
         except Exception as e:
             print(f"Error fetching collections: {e}")
             return []
@@ -141,7 +296,7 @@ class WixInventoryManager:
         Retrieves inventory items for the store.
         Uses Wix Stores API v2 Query endpoint.
         """
-        url = "https://www.wixapis.com/stores/v2/inventoryItems/query"
+        url = INVENTORY_QUERY_URL
         
         payload = {
             "query": {
@@ -154,9 +309,7 @@ class WixInventoryManager:
         
         print(f"Fetching inventory (offset={offset})...")
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json()
+            return self._request("POST", url, json=payload)
         except Exception as e:
             print(f"Error fetching inventory: {e}")
             return None
@@ -193,22 +346,39 @@ class WixInventoryManager:
             # Let's check if we got fewer items than requested (assuming default limit is 50 or 100)
             if len(items) < 50: # Assuming 50 is default/max
                 break
+            
+            # Offset paging is stateless, so once the total is known fetch the rest concurrently
+            total = result.get('totalResults')
+            if offset == 0 and total:
+                page = len(items)
+                all_items.extend(self._fetch_pages(lambda off: self.get_store_inventory(offset=off),
+                                                   range(page, total, page), 'inventoryItems'))
+                break
                 
             offset += len(items)
             
         return all_items
 
-    def get_all_products(self, include_variants=False):
+    def get_all_products(self, include_variants=False, fields=None):
         """
         Retrieves ALL products by handling pagination.
+        If fields is given (e.g. ("id", "name", "visible")), each page's products
+        are cut down to those keys as soon as the page arrives, so only the slim
+        dicts are kept while the remaining pages load.
         """
         all_products = []
         offset = 0
         limit = 100
+
+        def fetch_page(off):
+            result = self.get_store_products(limit=limit, offset=off, include_variants=include_variants)
+            if result and fields:
+                result['products'] = [{k: p[k] for k in fields if k in p} for p in result.get('products', [])]
+            return result
         
         while True:
             print(f"Fetching all products... (Current count: {len(all_products)})")
-            result = self.get_store_products(limit=limit, offset=offset, include_variants=include_variants)
+            result = fetch_page(offset)
             if not result:
                 break
                 
@@ -220,11 +390,30 @@ class WixInventoryManager:
             
             if len(products) < limit:
                 break
+            
+            # Offset paging is stateless, so once the total is known fetch the rest concurrently
+            total = result.get('totalResults')
+            if offset == 0 and total:
+                all_products.extend(self._fetch_pages(fetch_page, range(limit, total, limit), 'products'))
+                break
                 
             offset += len(products)
             
         return all_products
 
+    def _fetch_pages(self, fetch_page, offsets, key, max_workers=8):
+        """
+        Fetch the pages at the given offsets concurrently and return their
+        `key` items concatenated in offset order. Failed pages are skipped.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            results = list(ex.map(fetch_page, offsets))
+        items = []
+        for result in results:
+            if result:
+                items.extend(result.get(key, []))
+        return items
+
     def update_product_visibility(self, product_id, visible):
         """
         Update the visibility of a product.
@@ -238,40 +427,49 @@ class WixInventoryManager:
         }
         
         print(f"Updating visibility for Product {product_id} to {visible}...")
+        self._product_cache.pop(product_id, None)
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json()
+            return self._request("PATCH", url, json=payload)
         except requests.exceptions.RequestException as e:
             print(f"Error updating product visibility: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
+            _print_error_response(e)
             raise e
 
     def update_variant_visibility(self, product_id, variant_id, visible):
         """
         Update the visibility of a specific variant.
         """
-        # 1. Fetch the product to get current variants
+        return self.update_variants_visibility(product_id, {variant_id: visible})
+
+    def update_variants_visibility(self, product_id, updates):
+        """
+        Update the visibility of several variants of one product with a single
+        read-modify-write (one GET, one PATCH).
+        
+        Args:
+            product_id: The product's GUID
+            updates: Dict of variant ID -> visible (bool)
+        """
+        # 1. Fetch the product to get current variants (served from the product cache when fresh)
         product = self.get_product(product_id)
         if not product:
             raise Exception("Product not found")
             
         product_data = product.get('product', {})
-        variants = product_data.get('variants', [])
+        # Edit a copy: the cached product is shared with other threads and must
+        # not show flags the server has not accepted
+        variants = copy.deepcopy(product_data.get('variants', []))
         
-        # 2. Find and update the variant
-        found = False
+        # 2. Find and update the variants
+        missing = set(updates)
         for v in variants:
-            if v.get('id') == variant_id:
-                if 'variant' not in v:
-                    v['variant'] = {}
-                v['variant']['visible'] = visible
-                found = True
-                break
+            v_id = v.get('id')
+            if v_id in missing:
+                v.setdefault('variant', {})['visible'] = updates[v_id]
+                missing.discard(v_id)
         
-        if not found:
-            raise Exception(f"Variant {variant_id} not found in product {product_id}")
+        if missing:
+            raise Exception(f"Variant {', '.join(missing)} not found in product {product_id}")
             
         # 3. Update the product with the modified variants list
         # We only send the variants field to avoid overwriting other things
@@ -282,26 +480,34 @@ class WixInventoryManager:
             }
         }
         
-        print(f"Updating visibility for Variant {variant_id} to {visible}...")
+        print(f"Updating visibility for {len(updates)} variant(s) of Product {product_id}...")
+        # The cached copy is stale once the PATCH is sent
+        self._product_cache.pop(product_id, None)
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json()
+            result = self._request("PATCH", url, json=payload)
+            # The response carries the updated product, so the next edit can skip the GET
+            if result.get('product'):
+                self._product_cache[product_id] = (time.monotonic(), result)
+            return result
         except requests.exceptions.RequestException as e:
             print(f"Error updating variant visibility: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
+            _print_error_response(e)
             raise e
 
     def get_product(self, product_id):
         """
         Fetch a single product details.
+        A successful response is reused for PRODUCT_TTL seconds or until the product is updated.
         """
+        cached = self._product_cache.get(product_id)
+        if cached is not None and time.monotonic() - cached[0] < PRODUCT_TTL:
+            return cached[1]
+
         url = f"https://www.wixapis.com/stores/v1/products/{product_id}"
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+            product = self._request("GET", url)
+            self._product_cache[product_id] = (time.monotonic(), product)
+            return product
         except Exception as e:
             print(f"Error fetching product {product_id}: {e}")
             return None
@@ -309,14 +515,19 @@ class WixInventoryManager:
     def get_inventory_variants(self, product_id):
         """
         Get inventory information for a product's variants.
+        Successful responses are cached until the product's inventory is updated.
         """
+        cached = self._variant_cache.get(product_id)
+        if cached is not None:
+            return cached
+
         url = f"https://www.wixapis.com/stores/v2/inventoryItems/{product_id}/getVariants"
         
         try:
             # This endpoint is a POST request with empty body according to docs/example
-            response = requests.post(url, headers=self.headers, json={})
-            response.raise_for_status()
-            return response.json()
+            result = self._request("POST", url, json={})
+            self._variant_cache[product_id] = result
+            return result
         except requests.exceptions.RequestException as e:
             print(f"Error getting inventory variants: {e}")
             return None
@@ -352,18 +563,61 @@ class WixInventoryManager:
         }
         
         print(f"Updating inventory for Product: {product_id}...")
+        # Cached quantities for this product are stale from here on
+        self._variant_cache.pop(product_id, None)
         
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
-            response.raise_for_status()
+            result = self._request("PATCH", url, json=payload)
             print("Success! Inventory updated.")
-            return response.json()
+            return result
         except requests.exceptions.RequestException as e:
             print(f"Error updating inventory: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
+            _print_error_response(e)
             return None
 
+    def queue_inventory_update(self, product_id, variant_id, quantity):
+        """
+        Queue a stock change and return a Future for its update_inventory_variants result.
+        Changes queued within INVENTORY_FLUSH_DELAY seconds of each other are sent
+        together, one request per product; a later quantity for the same variant wins.
+        """
+        future = Future()
+        with self._pending_lock:
+            variants = self._pending_inventory.setdefault(product_id, {})
+            futures = variants.get(variant_id, (None, []))[1]
+            futures.append(future)
+            variants[variant_id] = (quantity, futures)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(INVENTORY_FLUSH_DELAY, self.flush_inventory_updates)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        return future
+
+    def flush_inventory_updates(self):
+        """
+        Send all queued stock changes now and resolve their futures.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self._pending_inventory = self._pending_inventory, {}
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            
+            for product_id, variants in pending.items():
+                variants_update = [{"variantId": v_id, "quantity": qty} for v_id, (qty, _) in variants.items()]
+                futures = [f for _, fs in variants.values() for f in fs]
+                try:
+                    result = self.update_inventory_variants(product_id, variants_update)
+                    if result is None:
+                        raise Exception(f"Inventory update failed for product {product_id}")
+                except Exception as e:
+                    for f in futures:
+                        f.set_exception(e)
+                else:
+                    for f in futures:
+                        f.set_result(result)
+
     def update_product_price(self, product_id, price):
         """
         Update the price of a product.
@@ -379,14 +633,12 @@ class WixInventoryManager:
         }
         
         print(f"Updating price for Product {product_id} to {price}...")
+        self._product_cache.pop(product_id, None)
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json()
+            return self._request("PATCH", url, json=payload)
         except requests.exceptions.RequestException as e:
             print(f"Error updating product price: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
+            _print_error_response(e)
             raise e
 
     def update_variant_price(self, product_id, variant_id, price, choices=None):
@@ -412,21 +664,19 @@ class WixInventoryManager:
         }
         
         print(f"Updating price for Variant {variant_id} (Product {product_id}) to {price}...")
+        self._product_cache.pop(product_id, None)
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json()
+            return self._request("PATCH", url, json=payload)
         except requests.exceptions.RequestException as e:
             print(f"Error updating variant price: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
+            _print_error_response(e)
             raise e
 
     def get_customers(self, limit=50, offset=0):
         """
         Retrieves a list of contacts/customers.
         """
-        url = "https://www.wixapis.com/contacts/v4/contacts/query"
+        url = CONTACTS_QUERY_URL
         payload = {
             "query": {
                 "paging": {
@@ -438,13 +688,10 @@ class WixInventoryManager:
         
         print(f"Fetching customers (offset={offset})...")
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json()
+            return self._request("POST", url, json=payload)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching customers: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response Body: {e.response.text}")
+            _print_error_response(e, "Response Body")
             return None
         except Exception as e:
             print(f"Error fetching customers: {e}")
@@ -454,7 +701,7 @@ class WixInventoryManager:
         """
         Retrieves orders, optionally filtered by customer ID or fulfillment status.
         """
-        url = "https://www.wixapis.com/stores/v2/orders/query"
+        url = ORDERS_QUERY_URL
         
         payload = {
             "query": {
@@ -474,17 +721,58 @@ class WixInventoryManager:
              filters["fulfillmentStatus"] = {"$eq": fulfillment_status}
 
         if filters:
-             payload["query"]["filter"] = json.dumps(filters)
+             payload["query"]["filter"] = _filter_json(filters)
 
         print(f"Fetching orders (customer_id={customer_id}, fulfillment={fulfillment_status}, offset={offset})...")
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json()
+            return self._request("POST", url, json=payload)
         except Exception as e:
             print(f"Error fetching orders: {e}")
             return None
 
+    def get_all_orders(self, customer_id=None, fulfillment_status=None, limit=100, max_orders=None):
+        """
+        Retrieves ALL orders matching the filters. Orders are paged by offset (the
+        v2 orders query has no cursor paging), so once the first page reports
+        totalResults the remaining pages are fetched concurrently.
+        At most max_orders orders are fetched when it is given.
+        """
+        def page_size(off):
+            # The last page before max_orders only asks for the orders still missing
+            return limit if max_orders is None else min(limit, max_orders - off)
+
+        def fetch_page(off):
+            return self.get_orders(customer_id=customer_id, limit=page_size(off), offset=off,
+                                   fulfillment_status=fulfillment_status)
+
+        all_orders = []
+        offset = 0
+        
+        while max_orders is None or offset < max_orders:
+            result = fetch_page(offset)
+            if not result:
+                break
+                
+            orders = result.get('orders', [])
+            if not orders:
+                break
+                
+            all_orders.extend(orders)
+            
+            if len(orders) < page_size(offset):
+                break
+            
+            total = result.get('totalResults')
+            if offset == 0 and total:
+                if max_orders is not None:
+                    total = min(total, max_orders)
+                all_orders.extend(self._fetch_pages(fetch_page, range(limit, total, limit), 'orders'))
+                break
+                
+            offset += len(orders)
+            
+        return all_orders if max_orders is None else all_orders[:max_orders]
+
     def get_order_ecom(self, order_id):
         """
         Retrieves a single order via the eCommerce v1 API, which includes
@@ -493,9 +781,7 @@ class WixInventoryManager:
         """
         url = f"https://www.wixapis.com/ecom/v1/orders/{order_id}"
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+            data = self._request("GET", url)
             return data.get('order', data)
         except Exception as e:
             print(f"Error fetching ecom order {order_id}: {e}")
@@ -505,78 +791,79 @@ class WixInventoryManager:
 # EXAMPLE USAGE
 # ============================================================================
 
-def example_usage():
-    # Configuration
-    try:
-        with open("wix_token.json", "r") as f:
-            token_data = json.load(f)
-            API_KEY = token_data.get("api_key")
-    except FileNotFoundError:
+# Collections example_usage lists when none are given on the command line
+# "הזרים של עדי", "החבילות של עדי", "העציצים של עדי"
+DEFAULT_COLLECTION_IDS = [
+    "69df4854-6806-a59e-2aec-f3e3bf0a37c8",
+    "244251b7-d043-e818-c93b-c2a38a6c08a1",
+    "7a704aef-57e7-8375-a644-38c0e0405539"
+]
+
+def example_usage(target_ids=None):
+    """
+    List products (with variant stock) for target_ids, or the first page of
+    the whole store when target_ids is empty.
+    """
+    # Configuration: WIX_TOKEN from the environment (no file access for cron/repeated runs),
+    # otherwise wix_token.json, otherwise wix_token.txt
+    API_KEY = os.environ.get("WIX_TOKEN")
+    if not API_KEY:
         try:
-            with open("wix_token.txt", "r") as f:
-                API_KEY = f.read().strip()
+            with open("wix_token.json", "r") as f:
+                token_data = json.load(f)
+                API_KEY = token_data.get("api_key")
         except FileNotFoundError:
-            print("Error: wix_token.json or wix_token.txt not found.")
-            return
+            try:
+                with open("wix_token.txt", "r") as f:
+                    API_KEY = f.read().strip()
+            except FileNotFoundError:
+                print("Error: no Wix token. Set WIX_TOKEN or create wix_token.json / wix_token.txt.")
+                sys.exit(1)
 
     SITE_ID = "3caddb6d-3f3e-4c84-b064-c6c03b8fe65e"
     ACCOUNT_ID = "e4f8bee0-0c16-4df9-b022-6cc29e961c9e"
     
-    manager = WixInventoryManager(API_KEY, SITE_ID, ACCOUNT_ID)
-    collections = manager.get_collections()
+    manager = WixInventoryManager(API_KEY, SITE_ID, ACCOUNT_ID, disk_cache=True)
     # 1. Filter Products by specific Collection IDs
-    # "הזרים של עדי": 69df4854-6806-a59e-2aec-f3e3bf0a37c8
-    # "החבילות של עדי": 244251b7-d043-e818-c93b-c2a38a6c08a1
-    # "העציצים של עדי": 7a704aef-57e7-8375-a644-38c0e0405539
-    target_ids = [
-        "69df4854-6806-a59e-2aec-f3e3bf0a37c8",
-        "244251b7-d043-e818-c93b-c2a38a6c08a1",
-        "7a704aef-57e7-8375-a644-38c0e0405539"
-    ]
-    
     if target_ids:
         print(f"Filtering by {len(target_ids)} collection IDs.")
-        # Use the new method for filtering by collection
-        # Note: The example only supports one collection ID at a time, so we'll loop or pick one.
-        # For this example, let's fetch products for each found collection.
-        
-        all_products = []
-        for col_id in target_ids:
-            print(f"\nFetching products for collection ID: {col_id}")
-            result = manager.query_products_by_collection(col_id, limit=50)
-            if result:
-                all_products.extend(result.get('products', []))
-        
-        # Remove duplicates if any (though unlikely if collections are distinct)
-        # Using dictionary comprehension to unique by ID
-        products = list({p['id']: p for p in all_products}.values())
+        # One query per page covers all the collections; products are printed as they stream in
+        products = manager.iter_products_by_collections(target_ids)
         
     else:
-        print("No matching categories found. Fetching all products.")
+        print("No collections given. Fetching all products.")
         products_result = manager.get_store_products(limit=50)
         products = products_result.get('products', []) if products_result else []
 
-    if products:
-        print(f"Retrieved {len(products)} products.")
-        
-        for product in products:
-            print(f"\nProduct: {product.get('name', 'Unknown')} (ID: {product.get('id')})")
-            variants = product.get('variants', [])
-            if variants:
-                print(f"  Variants ({len(variants)}):")
-                for v in variants:
-                    choices = v.get('choices', {})
-                    v_id = v.get('id')
-                    stock = v.get('stock', {})
-                    qty = stock.get('quantity', 'N/A')
-                    in_stock = stock.get('inStock', 'Unknown')
-                    
-                    print(f"    - ID: {v_id}")
-                    # Use json.dumps with ensure_ascii=False to print Hebrew choices correctly
-                    print(f"      Choices: {json.dumps(choices, ensure_ascii=False)}")
-                    print(f"      Qty: {qty}, In Stock: {in_stock}")
-            else:
-                print("  No variants found.")
+    # Hebrew choices must print as-is, not as \u escapes (orjson always emits UTF-8)
+    if ORJSON_AVAILABLE:
+        dumps = lambda obj: orjson.dumps(obj).decode("utf-8")
+    else:
+        dumps = functools.partial(json.dumps, ensure_ascii=False)
+    write = sys.stdout.write
+    count = 0
+    for product in products:
+        count += 1
+        # Each product's block is written with one call instead of a print per line
+        lines = [f"\nProduct: {product.get('name', 'Unknown')} (ID: {product.get('id')})"]
+        variants = product.get('variants', [])
+        if variants:
+            lines.append(f"  Variants ({len(variants)}):")
+            for v in variants:
+                choices = v.get('choices', {})
+                v_id = v.get('id')
+                stock = v.get('stock', {})
+                qty = stock.get('quantity', 'N/A')
+                in_stock = stock.get('inStock', 'Unknown')
+                
+                lines.append(f"    - ID: {v_id}")
+                lines.append(f"      Choices: {dumps(choices)}")
+                lines.append(f"      Qty: {qty}, In Stock: {in_stock}")
+        else:
+            lines.append("  No variants found.")
+        lines.append("")
+        write("\n".join(lines))
+    print(f"\nRetrieved {count} products.")
 
     # 2. Get Inventory Variants for a Product
     # product_id = "INSERT_PRODUCT_ID"
@@ -592,4 +879,10 @@ def example_usage():
     # manager.update_inventory_variants(product_id, variants_update)
 
 if __name__ == "__main__":
-    example_usage()
+    import argparse
+    parser = argparse.ArgumentParser(description="List Wix store products and variant stock.")
+    parser.add_argument("--collection-id", action="append", dest="collection_ids",
+                        help="collection to list (repeatable); defaults to DEFAULT_COLLECTION_IDS")
+    parser.add_argument("--all", action="store_true", help="list the whole store instead of collections")
+    args = parser.parse_args()
+    example_usage([] if args.all else (args.collection_ids or DEFAULT_COLLECTION_IDS))